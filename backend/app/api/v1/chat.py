@@ -1,6 +1,8 @@
 """Chat API endpoint for natural language conversation."""
 
-from fastapi import APIRouter, Depends
+from collections.abc import AsyncGenerator
+
+from fastapi import APIRouter, Depends, Request
 from qdrant_client.async_qdrant_client import AsyncQdrantClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -15,14 +17,29 @@ from app.services.memory_service import MemoryService
 router = APIRouter(prefix="/chat", tags=["chat"])
 
 
-def _get_chat_service(
+async def _get_chat_service(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     qdrant: AsyncQdrantClient = Depends(get_qdrant_from_app),
-) -> ChatService:
-    """Dependency to construct a ChatService with its collaborators."""
-    memory_service = MemoryService(db=db, qdrant=qdrant)
-    llm_router = LLMRouter(db=db)
-    return ChatService(db=db, llm_router=llm_router, memory_service=memory_service)
+) -> AsyncGenerator[ChatService, None]:
+    """Dependency to construct a ChatService on the app's shared LLM clients.
+
+    The router is released afterwards; shared clients stay open until shutdown.
+    """
+    memory_service = MemoryService(
+        db=db,
+        qdrant=qdrant,
+        upserter=getattr(request.app.state, "qdrant_upserter", None),
+    )
+    llm_router = LLMRouter(
+        db=db,
+        usage_sink=getattr(request.app.state, "usage_flusher", None),
+        clients=getattr(request.app.state, "llm_clients", None),
+    )
+    try:
+        yield ChatService(db=db, llm_router=llm_router, memory_service=memory_service)
+    finally:
+        await llm_router.aclose()
 
 
 @router.post("", response_model=ChatResponse, dependencies=[Depends(rate_limit_strict)])
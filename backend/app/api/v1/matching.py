@@ -3,7 +3,7 @@
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import select
+from sqlalchemy import bindparam, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
@@ -98,33 +98,40 @@ async def match_product_to_lines(
     """Find active production lines that support ALL required equipment types.
 
     Returns lines where the line_capability_matrix contains entries
-    covering every requested equipment type.
+    covering every requested equipment type. Matching is done in a single
+    grouped query rather than one capability lookup per line.
     """
-    lines_result = await db.execute(
-        select(ProductionLine).where(ProductionLine.status == "active")
-    )
-    active_lines = list(lines_result.scalars().all())
-
-    matched: list[dict] = []
     required_set = set(equipment_types)
+    line_type = LineCapabilityMatrix.equipment_type
 
-    for line in active_lines:
-        caps_result = await db.execute(
-            select(LineCapabilityMatrix.equipment_type).where(
-                LineCapabilityMatrix.production_line_id == line.id
-            )
+    stmt = (
+        select(
+            ProductionLine.id,
+            ProductionLine.name,
+            func.array_agg(func.distinct(line_type)).label("all_types"),
         )
-        line_types = {row[0] for row in caps_result.all()}
-
-        if required_set.issubset(line_types):
-            matched.append({
-                "production_line_id": str(line.id),
-                "name": line.name,
-                "matched_types": sorted(required_set & line_types),
-                "all_types": sorted(line_types),
-            })
-
-    return matched
+        .join(
+            LineCapabilityMatrix,
+            LineCapabilityMatrix.production_line_id == ProductionLine.id,
+        )
+        .where(ProductionLine.status == "active")
+        .group_by(ProductionLine.id, ProductionLine.name)
+        .having(
+            func.count(func.distinct(line_type)).filter(line_type.in_(required_set))
+            == bindparam("required_count", len(required_set))
+        )
+    )
+    result = await db.execute(stmt)
+
+    return [
+        {
+            "production_line_id": str(row.id),
+            "name": row.name,
+            "matched_types": sorted(required_set),
+            "all_types": sorted(row.all_types),
+        }
+        for row in result.all()
+    ]
 
 
 # Combine into a single router for registration
@@ -2,7 +2,7 @@
 
 from typing import Any
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 from qdrant_client.async_qdrant_client import AsyncQdrantClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -20,11 +20,16 @@ router = APIRouter(prefix="/memory", tags=["memory"])
 
 
 def _get_memory_service(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     qdrant: AsyncQdrantClient = Depends(get_qdrant_from_app),
 ) -> MemoryService:
     """Dependency to construct a MemoryService."""
-    return MemoryService(db=db, qdrant=qdrant)
+    return MemoryService(
+        db=db,
+        qdrant=qdrant,
+        upserter=getattr(request.app.state, "qdrant_upserter", None),
+    )
 
 
 @router.post("/search", response_model=list[dict[str, Any]])
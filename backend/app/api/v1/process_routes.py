@@ -13,6 +13,25 @@ from app.schemas.process_route import ProcessRouteCreate, ProcessRouteResponse
 router = APIRouter(prefix="/process-routes", tags=["process-routes"])
 
 
+def _to_response(route: ProcessRoute) -> ProcessRouteResponse:
+    """Build a response from an ORM row without re-validating it.
+
+    Columns are already typed by the ORM, so validation would only repeat
+    work; FastAPI passes model instances through without revalidating.
+    """
+    return ProcessRouteResponse.model_construct(
+        id=route.id,
+        product_id=route.product_id,
+        version=route.version,
+        is_active=route.is_active,
+        steps=route.steps,
+        source=route.source,
+        source_file=route.source_file,
+        created_at=route.created_at,
+        updated_at=route.updated_at,
+    )
+
+
 @router.get("", response_model=list[ProcessRouteResponse])
 async def list_process_routes(
     product_id: uuid.UUID | None = Query(None),
@@ -20,7 +39,7 @@ async def list_process_routes(
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
     db: AsyncSession = Depends(get_db),
-) -> list[ProcessRoute]:
+) -> list[ProcessRouteResponse]:
     """List process routes, optionally filtered by product_id and active status."""
     query = select(ProcessRoute)
 
@@ -32,7 +51,7 @@ async def list_process_routes(
 
     query = query.order_by(ProcessRoute.created_at.desc()).offset(skip).limit(limit)
     result = await db.execute(query)
-    return list(result.scalars().all())
+    return [_to_response(route) for route in result.scalars().all()]
 
 
 @router.post("", response_model=ProcessRouteResponse, status_code=status.HTTP_201_CREATED)
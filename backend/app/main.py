@@ -13,6 +13,9 @@ from app.core.database import async_session_factory, close_db, init_db
 from app.core.qdrant import close_qdrant, init_qdrant
 from app.core.redis import close_redis_compat, init_redis_compat
 from app.db.seed import seed_if_empty
+from app.services.compliance_service import UsageLogFlusher
+from app.services.llm_router import LLMClients, LLMConfig
+from app.services.qdrant_batcher import AsyncBatchUpserter
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +29,10 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     await init_db()
     logger.info("Database initialized")
 
+    # LLM usage rows are written in background batches, off the request path
+    app.state.usage_flusher = UsageLogFlusher(async_session_factory)
+    app.state.usage_flusher.start()
+
     async with async_session_factory() as session:
         result = await seed_if_empty(session)
         if result:
@@ -37,26 +44,42 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     await init_redis_compat(app.state)
     logger.info("Redis connected")
 
+    # Provider clients are shared by per-request routers so connections are reused
+    app.state.llm_clients = LLMClients.from_config(LLMConfig.from_settings())
+
     await init_qdrant(app.state)
     logger.info("Qdrant connected")
 
     # Ensure Qdrant 'memories' collection exists
-    from app.services.memory_service import MemoryService
+    from app.services.memory_service import MEMORIES_COLLECTION, MemoryService
 
     async with async_session_factory() as session:
         memory_svc = MemoryService(db=session, qdrant=app.state.qdrant)
         await memory_svc.ensure_collection()
     logger.info("Qdrant memories collection ready")
 
+    # Memory embeddings are upserted to Qdrant in background batches
+    app.state.qdrant_upserter = AsyncBatchUpserter(app.state.qdrant, MEMORIES_COLLECTION)
+    app.state.qdrant_upserter.start()
+
     yield
 
     # Shutdown
+    await app.state.qdrant_upserter.stop()
+    logger.info("Qdrant upsert queue flushed")
+
     await close_qdrant(app.state)
     logger.info("Qdrant disconnected")
 
     await close_redis_compat(app.state)
     logger.info("Redis disconnected")
 
+    await app.state.llm_clients.aclose()
+    logger.info("LLM clients closed")
+
+    await app.state.usage_flusher.stop()
+    logger.info("LLM usage log flushed")
+
     await close_db()
     logger.info("Database disconnected")
 
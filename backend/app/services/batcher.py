@@ -0,0 +1,104 @@
+"""Background write-coalescing queue.
+
+Writing records one at a time pays a round trip per record. BackgroundBatcher
+queues items without making the caller wait, and a background task hands them
+to a write callback in batches. The LLM usage-log flusher and the Qdrant
+upserter are both built on it.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class BackgroundBatcher(Generic[T]):
+    """Buffers items and writes them in batches from a background task.
+
+    ``write`` receives at most ``batch_size`` items per call; the loop waits
+    at most ``interval_seconds`` for a batch to fill. Items are dropped (and
+    counted) when the queue is full rather than blocking the caller.
+    ``write`` is expected to log and swallow its own errors.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[list[T]], Awaitable[None]],
+        batch_size: int,
+        interval_seconds: float,
+        max_queue: int,
+    ) -> None:
+        self._write = write
+        self._batch_size = batch_size
+        self._interval_seconds = interval_seconds
+        self._queue: asyncio.Queue[T] = asyncio.Queue(maxsize=max_queue)
+        self._batch: list[T] = []
+        self._task: asyncio.Task[None] | None = None
+        self._in_flight: asyncio.Future[None] | None = None
+        self.dropped = 0
+
+    def start(self) -> None:
+        """Start the background write loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the write loop and write everything still buffered.
+
+        A batch the loop was writing when cancelled is awaited first, so the
+        caller can safely close the destination once this returns.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._in_flight is not None:
+            await asyncio.gather(self._in_flight, return_exceptions=True)
+            self._in_flight = None
+        await self.flush()
+
+    def put(self, item: T) -> bool:
+        """Queue an item for the next batch. Returns False if it was dropped."""
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        return True
+
+    async def flush(self) -> None:
+        """Write all queued items immediately, ``batch_size`` at a time."""
+        while not self._queue.empty():
+            self._batch.append(self._queue.get_nowait())
+            if len(self._batch) >= self._batch_size:
+                await self._write_batch()
+        await self._write_batch()
+
+    async def _run(self) -> None:
+        """Collect items until the batch is full or the interval elapses, then write."""
+        loop = asyncio.get_running_loop()
+        while True:
+            self._batch.append(await self._queue.get())
+            deadline = loop.time() + self._interval_seconds
+            while len(self._batch) < self._batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    self._batch.append(
+                        await asyncio.wait_for(self._queue.get(), timeout)
+                    )
+                except asyncio.TimeoutError:
+                    break
+            # Shielded so cancelling the loop cannot abort a batch halfway
+            # through; stop() awaits the handle instead
+            self._in_flight = asyncio.ensure_future(self._write_batch())
+            await asyncio.shield(self._in_flight)
+            self._in_flight = None
+
+    async def _write_batch(self) -> None:
+        """Hand the current batch to the write callback."""
+        items, self._batch = self._batch, []
+        if items:
+            await self._write(items)
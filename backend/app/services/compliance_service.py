@@ -2,6 +2,7 @@
 
 Provides:
 - Model usage tracking: persist every LLM call to the database
+- Batched background flushing of usage records off the request path
 - Cost calculation per provider/model
 - Decision audit logging
 - Usage statistics aggregation for compliance dashboard
@@ -12,12 +13,13 @@ import uuid
 from datetime import datetime, timezone
 from typing import Any
 
-from sqlalchemy import func, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.models.compliance import ModelUsageLog
 from app.models.memory import DecisionLog
 from app.schemas.compliance import ComplianceReport, UsageStats
+from app.services.batcher import BackgroundBatcher
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +39,12 @@ COST_TABLE: dict[str, tuple[float, float]] = {
     "qwen2.5:7b": (0.0, 0.0),
 }
 
+# Background usage flushing: rows per INSERT, max wait before a partial batch
+# is written, and how many rows may queue before new ones are dropped
+USAGE_FLUSH_BATCH_SIZE = 100
+USAGE_FLUSH_INTERVAL_SECONDS = 1.0
+USAGE_FLUSH_QUEUE_SIZE = 1000
+
 
 class ComplianceService:
     """Tracks model usage, calculates costs, and manages audit logs."""
@@ -48,7 +56,7 @@ class ComplianceService:
     # Model Usage Tracking
     # -------------------------------------------------------------------
 
-    async def log_usage(
+    def add_usage(
         self,
         model_name: str,
         provider: str,
@@ -60,7 +68,10 @@ class ComplianceService:
         error_message: str | None = None,
         metadata: dict[str, Any] | None = None,
     ) -> ModelUsageLog:
-        """Persist a single LLM call record to the database."""
+        """Add a single LLM call record to the session without flushing.
+
+        The row is written when the caller's session is flushed or committed.
+        """
         total_tokens = input_tokens + output_tokens
         cost = self._calculate_cost(model_name, input_tokens, output_tokens)
 
@@ -75,10 +86,9 @@ class ComplianceService:
             latency_ms=latency_ms,
             status=status,
             error_message=error_message,
-            metadata=metadata,
+            extra_metadata=metadata,
         )
         self.db.add(log)
-        await self.db.flush()
 
         logger.info(
             "Logged usage: model=%s provider=%s tokens=%d cost=$%.6f task=%s",
@@ -86,6 +96,33 @@ class ComplianceService:
         )
         return log
 
+    async def log_usage(
+        self,
+        model_name: str,
+        provider: str,
+        task_type: str,
+        input_tokens: int,
+        output_tokens: int,
+        latency_ms: int,
+        status: str = "success",
+        error_message: str | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> ModelUsageLog:
+        """Persist a single LLM call record to the database."""
+        log = self.add_usage(
+            model_name=model_name,
+            provider=provider,
+            task_type=task_type,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            latency_ms=latency_ms,
+            status=status,
+            error_message=error_message,
+            metadata=metadata,
+        )
+        await self.db.flush()
+        return log
+
     # -------------------------------------------------------------------
     # Cost Calculation
     # -------------------------------------------------------------------
@@ -278,3 +315,63 @@ class ComplianceService:
             policy_violations=violations,
             recommendations=recommendations,
         )
+
+
+class UsageLogFlusher(BackgroundBatcher[dict[str, Any]]):
+    """Buffers LLM usage records and writes them to the database in batches.
+
+    LLM calls enqueue rows without waiting on the database; a background
+    task drains the queue and inserts up to ``batch_size`` rows per
+    statement using its own session. Rows are dropped (and counted) when
+    the queue is full rather than blocking the caller.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        batch_size: int = USAGE_FLUSH_BATCH_SIZE,
+        interval_seconds: float = USAGE_FLUSH_INTERVAL_SECONDS,
+        max_queue: int = USAGE_FLUSH_QUEUE_SIZE,
+    ) -> None:
+        super().__init__(self._insert_rows, batch_size, interval_seconds, max_queue)
+        self._session_factory = session_factory
+
+    def enqueue(
+        self,
+        model_name: str,
+        provider: str,
+        task_type: str,
+        input_tokens: int,
+        output_tokens: int,
+        latency_ms: int,
+        status: str = "success",
+        error_message: str | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> bool:
+        """Queue a usage row for the next batch. Returns False if it was dropped."""
+        row = {
+            "model_name": model_name,
+            "provider": provider,
+            "task_type": task_type,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+            "cost_usd": ComplianceService._calculate_cost(model_name, input_tokens, output_tokens),
+            "latency_ms": latency_ms,
+            "status": status,
+            "error_message": error_message,
+            "extra_metadata": metadata,
+        }
+        if not self.put(row):
+            logger.warning("Usage log queue full, dropped record (total dropped=%d)", self.dropped)
+            return False
+        return True
+
+    async def _insert_rows(self, rows: list[dict[str, Any]]) -> None:
+        """Insert one batch in a single executemany statement."""
+        try:
+            async with self._session_factory() as session:
+                await session.execute(insert(ModelUsageLog), rows)
+                await session.commit()
+        except Exception as exc:
+            logger.warning("Failed to flush %d LLM usage record(s): %s", len(rows), exc)
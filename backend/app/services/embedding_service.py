@@ -7,6 +7,7 @@ for storage in Qdrant and similarity search.
 import logging
 from typing import Any
 
+import numpy as np
 import openai
 
 from app.core.config import settings
@@ -33,10 +34,10 @@ class EmbeddingService:
         """Return the dimensionality of the embedding vectors."""
         return self._dimensions
 
-    async def embed_text(self, text: str) -> list[float]:
+    async def embed_text(self, text: str) -> np.ndarray:
         """Convert a single text string into a vector embedding.
 
-        Returns a list of floats representing the embedding vector.
+        Returns a 1-D float32 array representing the embedding vector.
         Raises RuntimeError if the OpenAI client is not configured.
         """
         if not self._client:
@@ -50,7 +51,7 @@ class EmbeddingService:
             dimensions=self._dimensions,
         )
 
-        embedding = response.data[0].embedding
+        embedding = np.asarray(response.data[0].embedding, dtype=np.float32)
         logger.info(
             "Generated embedding: model=%s dims=%d tokens=%d",
             self._model,
@@ -59,10 +60,10 @@ class EmbeddingService:
         )
         return embedding
 
-    async def embed_batch(self, texts: list[str]) -> list[list[float]]:
+    async def embed_batch(self, texts: list[str]) -> np.ndarray:
         """Convert multiple texts into vector embeddings in a single API call.
 
-        Returns a list of embedding vectors in the same order as the input texts.
+        Returns a 2-D float32 array with one row per input text, in input order.
         """
         if not self._client:
             raise RuntimeError(
@@ -70,7 +71,7 @@ class EmbeddingService:
             )
 
         if not texts:
-            return []
+            return np.empty((0, self._dimensions), dtype=np.float32)
 
         response = await self._client.embeddings.create(
             model=self._model,
@@ -80,7 +81,7 @@ class EmbeddingService:
 
         # Sort by index to preserve input order
         sorted_data = sorted(response.data, key=lambda d: d.index)
-        embeddings = [item.embedding for item in sorted_data]
+        embeddings = np.asarray([item.embedding for item in sorted_data], dtype=np.float32)
 
         logger.info(
             "Generated %d embeddings: model=%s tokens=%d",
@@ -0,0 +1,247 @@
+"""Response cache for LLMRouter.
+
+Identical prompts sent through the same provider chain return the stored
+response instead of paying another provider round trip and token spend.
+
+Provides:
+- CacheBackend protocol with in-memory (LRU + TTL) and Redis implementations
+- LLMCache: key derivation and (de)serialization of cached responses
+- SemanticCache: optional embedding-similarity tier consulted on exact misses
+"""
+
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any, Protocol
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Defaults for the shared application cache
+DEFAULT_CACHE_TTL_SECONDS = 3600
+DEFAULT_CACHE_MAX_ENTRIES = 10_000
+
+# Semantic tier: minimum cosine similarity for a hit, and index size
+DEFAULT_SEMANTIC_THRESHOLD = 0.95
+DEFAULT_SEMANTIC_MAX_ENTRIES = 1000
+_SEMANTIC_GROWTH_CHUNK = 64
+
+# Redis key namespace for cached LLM responses
+REDIS_KEY_PREFIX = "llmcache:"
+
+# BLAKE2b personalization so cache keys never collide with other hash uses
+_KEY_PERSON = b"llmcache"
+
+# Prompts whose answer depends on the current time should never be served from cache
+TIME_SENSITIVE_PATTERNS = (
+    r"\b(today|tonight|tomorrow|yesterday|now|right now|current time|currently)\b",
+    r"今天|今日|明天|昨天|現在|目前|此刻",
+)
+
+
+def _normalize(text: str) -> str:
+    """Lowercase and collapse whitespace so trivially different prompts share a key."""
+    return " ".join(text.lower().split())
+
+
+class CacheBackend(Protocol):
+    """Storage backend for cached LLM responses."""
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        """Return the cached value for key, or None if missing/expired."""
+        ...
+
+    async def set(self, key: str, value: dict[str, Any], ttl_seconds: int) -> None:
+        """Store value under key for ttl_seconds."""
+        ...
+
+
+class MemoryBackend:
+    """In-process LRU cache with per-entry expiry."""
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_MAX_ENTRIES) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: dict[str, Any], ttl_seconds: int) -> None:
+        self._entries[key] = (time.monotonic() + ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisBackend:
+    """Redis-backed cache shared across worker processes."""
+
+    def __init__(self, client: Any) -> None:
+        self._client = client
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        raw = await self._client.get(REDIS_KEY_PREFIX + key)
+        if raw is None:
+            return None
+        return json.loads(raw)
+
+    async def set(self, key: str, value: dict[str, Any], ttl_seconds: int) -> None:
+        await self._client.set(REDIS_KEY_PREFIX + key, json.dumps(value), ex=ttl_seconds)
+
+
+class LLMCache:
+    """Exact-match response cache keyed on provider chain, prompt, and task.
+
+    Prompts are compared after case and whitespace normalization. Prompts
+    matching any of ``exclude_patterns`` (case-insensitive regexes) bypass
+    the cache entirely.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        ttl_seconds: int = DEFAULT_CACHE_TTL_SECONDS,
+        exclude_patterns: Sequence[str] = (),
+    ) -> None:
+        self._backend = backend
+        self._ttl_seconds = ttl_seconds
+        self._exclude = [re.compile(p, re.IGNORECASE) for p in exclude_patterns]
+
+    def is_cacheable(self, prompt: str) -> bool:
+        """Return False if the prompt matches an exclusion pattern."""
+        return not any(pattern.search(prompt) for pattern in self._exclude)
+
+    @staticmethod
+    def make_key(
+        chain: Sequence[str],
+        prompt: str,
+        system: str,
+        task_type: str,
+        max_tokens: int,
+    ) -> str:
+        """Derive a stable cache key from everything that shapes the response.
+
+        Fields are fed to a 128-bit BLAKE2b hash separated by NUL bytes; the
+        chain keeps its order since it decides which provider answers.
+        """
+        digest = hashlib.blake2b(digest_size=16, person=_KEY_PERSON)
+        for part in (",".join(chain), _normalize(prompt), system, task_type, str(max_tokens)):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        """Look up a cached response; backend errors are treated as a miss."""
+        try:
+            return await self._backend.get(key)
+        except Exception as exc:
+            logger.warning("LLM cache lookup failed: %s", exc)
+            return None
+
+    async def set(self, key: str, value: dict[str, Any]) -> None:
+        """Store a response; backend errors are logged and ignored."""
+        try:
+            await self._backend.set(key, value, self._ttl_seconds)
+        except Exception as exc:
+            logger.warning("LLM cache store failed: %s", exc)
+
+
+class SemanticCache:
+    """In-process nearest-neighbour cache over prompt embeddings.
+
+    Responses are only reused within the same scope (provider chain, system
+    prompt, task type, and token limit) and only when the cosine similarity
+    of the normalized prompts reaches ``threshold``. Vectors live in one
+    float32 matrix grown in chunks; once ``max_entries`` is reached the
+    oldest entry is overwritten.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[str], Awaitable[Sequence[float] | np.ndarray]],
+        threshold: float = DEFAULT_SEMANTIC_THRESHOLD,
+        max_entries: int = DEFAULT_SEMANTIC_MAX_ENTRIES,
+    ) -> None:
+        self._embed = embed
+        self._threshold = threshold
+        self._max_entries = max_entries
+        self._vectors: np.ndarray | None = None
+        self._scope_ids = np.zeros(0, dtype=np.int64)
+        self._scopes: dict[str, int] = {}
+        self._values: list[dict[str, Any]] = []
+        self._next_slot = 0
+
+    async def embed(self, prompt: str) -> np.ndarray | None:
+        """Return the unit-length embedding of the normalized prompt, or None on error."""
+        try:
+            vector = np.asarray(await self._embed(_normalize(prompt)), dtype=np.float32)
+        except Exception as exc:
+            logger.warning("Semantic cache embedding failed: %s", exc)
+            return None
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else None
+
+    def lookup(self, scope: str, vector: np.ndarray) -> tuple[dict[str, Any], float] | None:
+        """Return the closest cached response in scope and its similarity, if above threshold."""
+        scope_id = self._scopes.get(scope)
+        if scope_id is None or self._vectors is None:
+            return None
+        count = len(self._values)
+        sims = self._vectors[:count] @ vector
+        sims[self._scope_ids[:count] != scope_id] = -1.0
+        best = int(np.argmax(sims))
+        similarity = float(sims[best])
+        if similarity < self._threshold:
+            return None
+        return self._values[best], similarity
+
+    def add(self, scope: str, vector: np.ndarray, value: dict[str, Any]) -> None:
+        """Index a response under its prompt embedding."""
+        scope_id = self._scopes.setdefault(scope, len(self._scopes))
+        count = len(self._values)
+        if count < self._max_entries:
+            self._ensure_capacity(count + 1, vector.shape[0])
+            slot = count
+            self._values.append(value)
+        else:
+            slot = self._next_slot
+            self._next_slot = (slot + 1) % self._max_entries
+            self._values[slot] = value
+        assert self._vectors is not None
+        self._vectors[slot] = vector
+        self._scope_ids[slot] = scope_id
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def _ensure_capacity(self, needed: int, dims: int) -> None:
+        """Grow the vector matrix in chunks so adds do not reallocate every time."""
+        capacity = 0 if self._vectors is None else self._vectors.shape[0]
+        if needed <= capacity:
+            return
+        new_capacity = min(
+            max(capacity * 2, capacity + _SEMANTIC_GROWTH_CHUNK), self._max_entries,
+        )
+        vectors = np.zeros((new_capacity, dims), dtype=np.float32)
+        scope_ids = np.full(new_capacity, -1, dtype=np.int64)
+        if self._vectors is not None:
+            vectors[:capacity] = self._vectors
+            scope_ids[:capacity] = self._scope_ids
+        self._vectors = vectors
+        self._scope_ids = scope_ids
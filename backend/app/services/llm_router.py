@@ -2,12 +2,15 @@
 
 Implements a fallback chain: Claude → OpenAI → Ollama.
 Normalizes responses across providers into a unified format.
+Serves repeated prompts from a response cache.
 Logs usage (tokens, cost, latency) per call.
 """
 
+import asyncio
 import logging
 import time
-from dataclasses import dataclass, field
+from collections import deque
+from dataclasses import asdict, dataclass, field
 from typing import Any
 
 import anthropic
@@ -15,6 +18,8 @@ import openai
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.services.compliance_service import ComplianceService, UsageLogFlusher
+from app.services.llm_cache import LLMCache, MemoryBackend, SemanticCache
 
 logger = logging.getLogger(__name__)
 
@@ -23,10 +28,39 @@ DEFAULT_CLAUDE_MODEL = "claude-sonnet-4-6"
 DEFAULT_OPENAI_MODEL = "gpt-4.1-mini"
 DEFAULT_OLLAMA_MODEL = "llama3.1:8b"
 
+# Provider fallback orders
+DEFAULT_CHAIN: tuple[str, ...] = ("claude", "openai", "ollama")
+LOCAL_FIRST_CHAIN: tuple[str, ...] = ("ollama", "claude", "openai")
 
-@dataclass
+# Providers a hedged call may race; the local model is only a serial fallback
+HEDGE_PROVIDERS: frozenset[str] = frozenset({"claude", "openai"})
+
+# Task types whose answers depend only on the prompt and may be served from the
+# shared response cache; free-form chat is conversational and never cached
+CACHEABLE_TASK_TYPES: frozenset[str] = frozenset({"general", "scheduling"})
+
+# Delay before a hedged call launches the next provider in the chain
+DEFAULT_HEDGE_STAGGER_MS = 400
+
+# In-memory usage records kept per router; older entries are dropped first
+USAGE_LOG_MAX_ENTRIES = 10_000
+
+# Failed calls kept separately so failure reporting never scans the full log
+FAILURE_LOG_MAX_ENTRIES = 1000
+
+# Per (provider, error) key, only this many failures per window are kept verbatim;
+# the rest of an outage is only counted
+FAILURE_SAMPLE_LIMIT = 10
+FAILURE_SAMPLE_WINDOW_SECONDS = 60.0
+FAILURE_SAMPLE_ERROR_PREFIX = 64
+
+
+@dataclass(slots=True, frozen=True)
 class LLMResponse:
-    """Normalized response from any LLM provider."""
+    """Normalized response from any LLM provider.
+
+    Immutable and hashable; ``metadata`` is excluded from the hash.
+    """
 
     content: str
     provider: str
@@ -34,7 +68,74 @@ class LLMResponse:
     input_tokens: int = 0
     output_tokens: int = 0
     latency_ms: float = 0.0
-    metadata: dict[str, Any] = field(default_factory=dict)
+    metadata: dict[str, Any] = field(default_factory=dict, hash=False)
+
+
+@dataclass(slots=True)
+class LLMConfig:
+    """Provider credentials and endpoints used to build LLM clients."""
+
+    anthropic_api_key: str = ""
+    openai_api_key: str = ""
+    ollama_base_url: str = "http://localhost:11434"
+
+    @classmethod
+    def from_settings(cls, source: Any = None) -> "LLMConfig":
+        """Build a config from application settings (defaults to the global settings)."""
+        source = source if source is not None else settings
+        return cls(
+            anthropic_api_key=source.ANTHROPIC_API_KEY,
+            openai_api_key=source.OPENAI_API_KEY,
+            ollama_base_url=source.OLLAMA_BASE_URL,
+        )
+
+
+def _build_anthropic(config: LLMConfig) -> anthropic.AsyncAnthropic:
+    """Build an Anthropic client; retries are left to the fallback chain."""
+    return anthropic.AsyncAnthropic(api_key=config.anthropic_api_key, max_retries=0)
+
+
+def _build_openai(config: LLMConfig) -> openai.AsyncOpenAI:
+    """Build an OpenAI client; retries are left to the fallback chain."""
+    return openai.AsyncOpenAI(api_key=config.openai_api_key, max_retries=0)
+
+
+def _build_ollama(config: LLMConfig) -> openai.AsyncOpenAI:
+    """Build a client for Ollama's OpenAI-compatible endpoint."""
+    return openai.AsyncOpenAI(
+        base_url=f"{config.ollama_base_url}/v1",
+        api_key="ollama",  # Ollama doesn't require a real key
+        max_retries=0,
+    )
+
+
+@dataclass(slots=True)
+class LLMClients:
+    """Provider clients shared by many routers so their connection pools are reused.
+
+    Built once at application startup and closed at shutdown; routers given
+    these clients never close them.
+    """
+
+    anthropic_client: anthropic.AsyncAnthropic | None = None
+    openai_client: openai.AsyncOpenAI | None = None
+    ollama_client: openai.AsyncOpenAI | None = None
+
+    @classmethod
+    def from_config(cls, config: LLMConfig) -> "LLMClients":
+        """Build a client for every provider the config has credentials for."""
+        return cls(
+            anthropic_client=_build_anthropic(config) if config.anthropic_api_key else None,
+            openai_client=_build_openai(config) if config.openai_api_key else None,
+            ollama_client=_build_ollama(config),
+        )
+
+    async def aclose(self) -> None:
+        """Close every client and release its HTTP connection pool."""
+        for client in (self.anthropic_client, self.openai_client, self.ollama_client):
+            if client is not None:
+                await client.close()
+        self.anthropic_client = self.openai_client = self.ollama_client = None
 
 
 @dataclass
@@ -49,29 +150,66 @@ class _UsageRecord:
     task_type: str
     success: bool
     error: str | None = None
+    cached: bool = False
+
+
+@dataclass(slots=True)
+class _FailureSample:
+    """Rate-limit state and totals for one (provider, error) failure key."""
+
+    window_start: float
+    in_window: int = 0
+    total: int = 0
+    suppressed: int = 0
 
 
 class LLMRouter:
     """Routes LLM calls through a multi-model fallback chain with usage tracking."""
 
-    def __init__(self, db: AsyncSession | None = None) -> None:
+    def __init__(
+        self,
+        config: LLMConfig | None = None,
+        db: AsyncSession | None = None,
+        cache: LLMCache | None = None,
+        usage_sink: UsageLogFlusher | None = None,
+        semantic_cache: SemanticCache | None = None,
+        clients: LLMClients | None = None,
+    ) -> None:
         self._anthropic: anthropic.AsyncAnthropic | None = None
         self._openai: openai.AsyncOpenAI | None = None
+        self._ollama: openai.AsyncOpenAI | None = None
+        self._config = config if config is not None else LLMConfig.from_settings()
         self._db = db
-        self._usage_log: list[_UsageRecord] = []
-
-        # Initialize clients based on available API keys
-        if settings.ANTHROPIC_API_KEY:
-            self._anthropic = anthropic.AsyncAnthropic(
-                api_key=settings.ANTHROPIC_API_KEY,
-                max_retries=0,
-            )
-
-        if settings.OPENAI_API_KEY:
-            self._openai = openai.AsyncOpenAI(
-                api_key=settings.OPENAI_API_KEY,
-                max_retries=0,
-            )
+        self._usage_sink = usage_sink
+        self._usage_log: deque[_UsageRecord] = deque(maxlen=USAGE_LOG_MAX_ENTRIES)
+        self._failures: deque[_UsageRecord] = deque(maxlen=FAILURE_LOG_MAX_ENTRIES)
+        self._stats: dict[str, int] = {"success": 0, "failure": 0}
+        self._err_sampler: dict[tuple[str, str], _FailureSample] = {}
+        # Callers share an app-wide cache; a private in-memory one is the fallback
+        self._cache = cache if cache is not None else LLMCache(MemoryBackend())
+        self._semantic_cache = semantic_cache
+
+        # Shared clients belong to the caller; otherwise build our own from the config
+        self._owns_clients = clients is None
+        if clients is not None:
+            self._anthropic = clients.anthropic_client
+            self._openai = clients.openai_client
+            self._ollama = clients.ollama_client
+        else:
+            if self._config.anthropic_api_key:
+                self._anthropic = _build_anthropic(self._config)
+            if self._config.openai_api_key:
+                self._openai = _build_openai(self._config)
+
+    async def aclose(self) -> None:
+        """Release provider clients, closing them only if this router built them."""
+        if self._owns_clients:
+            for client in (self._anthropic, self._openai, self._ollama):
+                if client is not None:
+                    await client.close()
+        self._anthropic = None
+        self._openai = None
+        self._ollama = None
 
     async def call(
         self,
@@ -80,48 +218,205 @@ class LLMRouter:
         task_type: str = "general",
         prefer_local: bool = False,
         max_tokens: int = 2048,
+        use_cache: bool = True,
+        hedge: bool = False,
+        stagger_ms: int = DEFAULT_HEDGE_STAGGER_MS,
     ) -> LLMResponse:
         """Send a prompt through the fallback chain and return a normalized response.
 
         Fallback order: Claude → OpenAI → Ollama.
         If ``prefer_local`` is True, Ollama is tried first.
+        Identical requests are answered from the cache when ``task_type`` is in
+        ``CACHEABLE_TASK_TYPES``, unless ``use_cache`` is False or the cache
+        excludes the prompt. With a ``semantic_cache``,
+        exact misses may be answered from a sufficiently similar earlier prompt;
+        that tier is skipped when ``prefer_local`` is set, since embedding the
+        prompt would send it off-host.
+        If ``hedge`` is True, cloud providers are raced instead of tried one by
+        one: the next provider starts after ``stagger_ms`` (or as soon as one
+        fails) and the first success wins; Ollama remains the fallback if all
+        of them fail. ``hedge`` is ignored when ``prefer_local`` is set, so a
+        prompt kept local only reaches the cloud after Ollama has failed.
         """
-        providers: list[str] = (
-            ["ollama", "claude", "openai"] if prefer_local
-            else ["claude", "openai", "ollama"]
+        providers = LOCAL_FIRST_CHAIN if prefer_local else DEFAULT_CHAIN
+
+        cache_key: str | None = None
+        semantic_scope = ""
+        prompt_vector = None
+        if (
+            use_cache
+            and task_type in CACHEABLE_TASK_TYPES
+            and self._cache.is_cacheable(prompt)
+        ):
+            cache_key = LLMCache.make_key(providers, prompt, system, task_type, max_tokens)
+            cached = await self._cache.get(cache_key)
+            if cached is not None:
+                return self._serve_cached(cached, task_type)
+
+            # On an exact miss, fall back to the closest semantically equivalent
+            # prompt; prompts kept local for privacy are never sent to the embedder
+            if self._semantic_cache is not None and not prefer_local:
+                semantic_scope = LLMCache.make_key(providers, "", system, task_type, max_tokens)
+                prompt_vector = await self._semantic_cache.embed(prompt)
+                if prompt_vector is not None:
+                    match = self._semantic_cache.lookup(semantic_scope, prompt_vector)
+                    if match is not None:
+                        cached, similarity = match
+                        return self._serve_cached(
+                            cached, task_type, similarity=round(similarity, 4),
+                        )
+
+        available = self._available_providers(providers)
+        if hedge and not prefer_local:
+            raced = [p for p in available if p in HEDGE_PROVIDERS]
+            fallback = [p for p in available if p not in HEDGE_PROVIDERS]
+            try:
+                response = await self._call_hedged(
+                    raced, prompt, system, task_type, max_tokens, stagger_ms,
+                )
+            except RuntimeError:
+                if not fallback:
+                    raise
+                response = await self._call_sequential(
+                    fallback, prompt, system, task_type, max_tokens,
+                )
+        else:
+            response = await self._call_sequential(
+                available, prompt, system, task_type, max_tokens,
+            )
+
+        if cache_key is not None:
+            await self._cache.set(cache_key, asdict(response))
+            if self._semantic_cache is not None and prompt_vector is not None:
+                self._semantic_cache.add(semantic_scope, prompt_vector, asdict(response))
+        return response
+
+    def _serve_cached(
+        self, cached: dict[str, Any], task_type: str, **extra_metadata: Any,
+    ) -> LLMResponse:
+        """Rebuild a cached response, flag it as cached, and log a zero-token hit."""
+        hit = LLMResponse(**{
+            **cached,
+            "metadata": {**cached.get("metadata", {}), "cached": True, **extra_metadata},
+        })
+        self._log_usage(
+            provider=hit.provider,
+            model=hit.model,
+            input_tokens=0,
+            output_tokens=0,
+            latency_ms=0,
+            task_type=task_type,
+            success=True,
+            cached=True,
         )
+        return hit
+
+    def _available_providers(self, providers: tuple[str, ...]) -> list[str]:
+        """Filter the chain down to providers that have a configured client."""
+        return [
+            p for p in providers
+            if (p == "claude" and self._anthropic)
+            or (p == "openai" and self._openai)
+            or p == "ollama"
+        ]
 
+    async def _dispatch(
+        self, provider: str, prompt: str, system: str, task_type: str, max_tokens: int,
+    ) -> LLMResponse:
+        """Call a single provider by name."""
+        if provider == "claude":
+            return await self._call_claude(prompt, system, task_type, max_tokens)
+        if provider == "openai":
+            return await self._call_openai(prompt, system, task_type, max_tokens)
+        return await self._call_ollama(prompt, system, task_type, max_tokens)
+
+    async def _call_sequential(
+        self,
+        providers: list[str],
+        prompt: str,
+        system: str,
+        task_type: str,
+        max_tokens: int,
+    ) -> LLMResponse:
+        """Try providers one at a time, falling back on failure."""
         last_error: Exception | None = None
 
         for provider in providers:
             try:
-                if provider == "claude" and self._anthropic:
-                    return await self._call_claude(prompt, system, task_type, max_tokens)
-                elif provider == "openai" and self._openai:
-                    return await self._call_openai(prompt, system, task_type, max_tokens)
-                elif provider == "ollama":
-                    return await self._call_ollama(prompt, system, task_type, max_tokens)
+                return await self._dispatch(provider, prompt, system, task_type, max_tokens)
             except Exception as exc:
                 last_error = exc
-                logger.warning(
-                    "LLM provider %s failed for task_type=%s: %s",
-                    provider, task_type, exc,
-                )
-                await self._log_usage(
-                    provider=provider,
-                    model="",
-                    input_tokens=0,
-                    output_tokens=0,
-                    latency_ms=0,
-                    task_type=task_type,
-                    success=False,
-                    error=str(exc),
+                self._record_failure(provider, task_type, exc)
+
+        raise RuntimeError(
+            f"All LLM providers failed. Last error: {last_error}"
+        )
+
+    async def _call_hedged(
+        self,
+        providers: list[str],
+        prompt: str,
+        system: str,
+        task_type: str,
+        max_tokens: int,
+        stagger_ms: int,
+    ) -> LLMResponse:
+        """Race providers with a stagger, returning the first success.
+
+        Losing requests are cancelled and awaited so no CancelledError is
+        left unobserved.
+        """
+        queue = list(providers)
+        pending: set[asyncio.Task[LLMResponse]] = set()
+        task_provider: dict[asyncio.Task[LLMResponse], str] = {}
+        last_error: BaseException | None = None
+
+        try:
+            while queue or pending:
+                if queue:
+                    provider = queue.pop(0)
+                    task = asyncio.create_task(
+                        self._dispatch(provider, prompt, system, task_type, max_tokens)
+                    )
+                    task_provider[task] = provider
+                    pending.add(task)
+
+                # Give in-flight requests a head start before launching the next one
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=stagger_ms / 1000.0 if queue else None,
+                    return_when=asyncio.FIRST_COMPLETED,
                 )
+                for task in done:
+                    exc = task.exception()
+                    if exc is None:
+                        return task.result()
+                    last_error = exc
+                    self._record_failure(task_provider[task], task_type, exc)
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
 
         raise RuntimeError(
             f"All LLM providers failed. Last error: {last_error}"
         )
 
+    def _record_failure(
+        self, provider: str, task_type: str, exc: BaseException,
+    ) -> None:
+        """Record a provider failure in the usage log."""
+        self._log_usage(
+            provider=provider,
+            model="",
+            input_tokens=0,
+            output_tokens=0,
+            latency_ms=0,
+            task_type=task_type,
+            success=False,
+            error=str(exc),
+        )
+
     # -------------------------------------------------------------------
     # Provider implementations
     # -------------------------------------------------------------------
@@ -132,7 +427,7 @@ class LLMRouter:
         """Call Anthropic Claude API."""
         assert self._anthropic is not None
         model = DEFAULT_CLAUDE_MODEL
-        start = time.monotonic()
+        start_ns = time.perf_counter_ns()
 
         message = await self._anthropic.messages.create(
             model=model,
@@ -141,12 +436,12 @@ class LLMRouter:
             messages=[{"role": "user", "content": prompt}],
         )
 
-        latency = (time.monotonic() - start) * 1000
+        latency = (time.perf_counter_ns() - start_ns) / 1_000_000
         content = message.content[0].text if message.content else ""
         input_tokens = message.usage.input_tokens
         output_tokens = message.usage.output_tokens
 
-        await self._log_usage(
+        self._log_usage(
             provider="claude",
             model=model,
             input_tokens=input_tokens,
@@ -171,7 +466,7 @@ class LLMRouter:
         """Call OpenAI API."""
         assert self._openai is not None
         model = DEFAULT_OPENAI_MODEL
-        start = time.monotonic()
+        start_ns = time.perf_counter_ns()
 
         messages: list[dict[str, str]] = []
         if system:
@@ -184,12 +479,12 @@ class LLMRouter:
             max_tokens=max_tokens,
         )
 
-        latency = (time.monotonic() - start) * 1000
+        latency = (time.perf_counter_ns() - start_ns) / 1_000_000
         content = response.choices[0].message.content or ""
         input_tokens = response.usage.prompt_tokens if response.usage else 0
         output_tokens = response.usage.completion_tokens if response.usage else 0
 
-        await self._log_usage(
+        self._log_usage(
             provider="openai",
             model=model,
             input_tokens=input_tokens,
@@ -213,13 +508,9 @@ class LLMRouter:
     ) -> LLMResponse:
         """Call Ollama local LLM via OpenAI-compatible endpoint."""
         model = DEFAULT_OLLAMA_MODEL
-        start = time.monotonic()
+        start_ns = time.perf_counter_ns()
 
-        client = openai.AsyncOpenAI(
-            base_url=f"{settings.OLLAMA_BASE_URL}/v1",
-            api_key="ollama",  # Ollama doesn't require a real key
-            max_retries=0,
-        )
+        client = self._get_ollama_client()
 
         messages: list[dict[str, str]] = []
         if system:
@@ -232,12 +523,12 @@ class LLMRouter:
             max_tokens=max_tokens,
         )
 
-        latency = (time.monotonic() - start) * 1000
+        latency = (time.perf_counter_ns() - start_ns) / 1_000_000
         content = response.choices[0].message.content or ""
         input_tokens = response.usage.prompt_tokens if response.usage else 0
         output_tokens = response.usage.completion_tokens if response.usage else 0
 
-        await self._log_usage(
+        self._log_usage(
             provider="ollama",
             model=model,
             input_tokens=input_tokens,
@@ -256,11 +547,17 @@ class LLMRouter:
             latency_ms=round(latency, 1),
         )
 
+    def _get_ollama_client(self) -> openai.AsyncOpenAI:
+        """Return the Ollama client, creating it on first use and reusing it afterwards."""
+        if self._ollama is None:
+            self._ollama = _build_ollama(self._config)
+        return self._ollama
+
     # -------------------------------------------------------------------
     # Usage logging
     # -------------------------------------------------------------------
 
-    async def _log_usage(
+    def _log_usage(
         self,
         provider: str,
         model: str,
@@ -270,11 +567,19 @@ class LLMRouter:
         task_type: str,
         success: bool,
         error: str | None = None,
+        cached: bool = False,
     ) -> None:
         """Record usage for auditing and compliance.
 
-        When a DB session is available, persists to ModelUsageLog via
-        ComplianceService.  Always keeps an in-memory copy as well.
+        With a ``usage_sink``, the record is queued for a batched background
+        insert. Otherwise, when a DB session is available, a ModelUsageLog row
+        is added to it via ComplianceService and written when the caller
+        commits. Nothing here awaits, so logging costs no event-loop trip.
+        Cache hits are recorded with zero tokens and ``cached=True``.
+
+        An in-memory copy is kept as well, except for repeated failures: per
+        (provider, error) only ``FAILURE_SAMPLE_LIMIT`` failures per window
+        are logged and kept; the rest only update the failure counters.
         """
         record = _UsageRecord(
             provider=provider,
@@ -285,20 +590,39 @@ class LLMRouter:
             task_type=task_type,
             success=success,
             error=error,
+            cached=cached,
         )
-        self._usage_log.append(record)
-        logger.info(
-            "LLM usage: provider=%s model=%s tokens=%d+%d latency=%.0fms task=%s ok=%s",
-            provider, model, input_tokens, output_tokens, latency_ms, task_type, success,
-        )
+        self._stats["success" if success else "failure"] += 1
+        if success:
+            self._usage_log.append(record)
+            logger.info(
+                "LLM usage: provider=%s model=%s tokens=%d+%d latency=%.0fms task=%s ok=%s cached=%s",
+                provider, model, input_tokens, output_tokens, latency_ms, task_type, success, cached,
+            )
+        elif self._sample_failure(provider, error or ""):
+            self._usage_log.append(record)
+            self._failures.append(record)
+            logger.warning(
+                "LLM provider %s failed for task_type=%s: %s",
+                provider, task_type, error,
+            )
 
-        # Persist to DB if session is available
-        if self._db is not None:
+        if self._usage_sink is not None:
+            self._usage_sink.enqueue(
+                model_name=model,
+                provider=provider,
+                task_type=task_type,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                latency_ms=int(round(latency_ms)),
+                status="success" if success else "error",
+                error_message=error,
+                metadata={"cached": True} if cached else None,
+            )
+        # Otherwise add the row to the caller's session; it is written on commit
+        elif self._db is not None:
             try:
-                from app.services.compliance_service import ComplianceService
-
-                compliance = ComplianceService(self._db)
-                await compliance.log_usage(
+                ComplianceService(self._db).add_usage(
                     model_name=model,
                     provider=provider,
                     task_type=task_type,
@@ -307,22 +631,71 @@ class LLMRouter:
                     latency_ms=int(round(latency_ms)),
                     status="success" if success else "error",
                     error_message=error,
+                    metadata={"cached": True} if cached else None,
                 )
             except Exception as exc:
                 logger.warning("Failed to persist LLM usage to DB: %s", exc)
 
     def get_usage_log(self) -> list[dict[str, Any]]:
-        """Return usage log as a list of dicts for compliance reporting."""
+        """Return usage log as a list of dicts for compliance reporting.
+
+        Only the most recent ``USAGE_LOG_MAX_ENTRIES`` records are retained;
+        the database copy is the complete audit trail.
+        """
+        return [self._record_to_dict(r) for r in self._usage_log]
+
+    def get_failure_count(self) -> int:
+        """Return the number of failed calls since this router was created."""
+        return self._stats["failure"]
+
+    def _sample_failure(self, provider: str, error: str) -> bool:
+        """Count a failure and return whether it should be kept verbatim."""
+        key = (provider, error[:FAILURE_SAMPLE_ERROR_PREFIX])
+        now = time.monotonic()
+        sample = self._err_sampler.get(key)
+        if sample is None:
+            sample = self._err_sampler[key] = _FailureSample(window_start=now)
+        elif now - sample.window_start >= FAILURE_SAMPLE_WINDOW_SECONDS:
+            sample.window_start = now
+            sample.in_window = 0
+
+        sample.total += 1
+        sample.in_window += 1
+        if sample.in_window > FAILURE_SAMPLE_LIMIT:
+            sample.suppressed += 1
+            return False
+        return True
+
+    def get_failure_counters(self) -> list[dict[str, Any]]:
+        """Return failure totals per (provider, error prefix), including suppressed ones."""
         return [
             {
-                "provider": r.provider,
-                "model": r.model,
-                "input_tokens": r.input_tokens,
-                "output_tokens": r.output_tokens,
-                "latency_ms": r.latency_ms,
-                "task_type": r.task_type,
-                "success": r.success,
-                "error": r.error,
+                "provider": provider,
+                "error": error,
+                "total": sample.total,
+                "suppressed": sample.suppressed,
             }
-            for r in self._usage_log
+            for (provider, error), sample in self._err_sampler.items()
         ]
+
+    def get_recent_failures(self) -> list[dict[str, Any]]:
+        """Return the most recent failed calls, oldest first.
+
+        At most ``FAILURE_LOG_MAX_ENTRIES`` records are retained.
+        """
+        return [self._record_to_dict(r) for r in self._failures]
+
+    @staticmethod
+    def _record_to_dict(record: _UsageRecord) -> dict[str, Any]:
+        """Convert a usage record into its reporting dict."""
+        return {
+            "provider": record.provider,
+            "model": record.model,
+            "input_tokens": record.input_tokens,
+            "output_tokens": record.output_tokens,
+            "latency_ms": record.latency_ms,
+            "task_type": record.task_type,
+            "success": record.success,
+            "error": record.error,
+            "cached": record.cached,
+        }
@@ -8,6 +8,7 @@ Provides:
 """
 
 import logging
+import re
 import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Any
@@ -21,12 +22,13 @@ from qdrant_client.models import (
     PointStruct,
     VectorParams,
 )
-from sqlalchemy import func, select, update
+from sqlalchemy import case, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.memory import DecisionLog, MemoryEntry
 from app.schemas.memory import DecisionLogResponse, MemoryEntryResponse
 from app.services.embedding_service import EmbeddingService
+from app.services.qdrant_batcher import AsyncBatchUpserter
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +42,22 @@ WARM_THRESHOLD_DAYS = 90
 # Default embedding dimensions (must match EmbeddingService)
 EMBEDDING_DIMENSIONS = 1536
 
+# Importance scoring: per-category boost and keywords that each add a boost once
+_CATEGORY_WEIGHTS: dict[str, float] = {
+    "scheduling": 0.15,
+    "rush_order": 0.2,
+    "exception": 0.2,
+    "simulation": 0.1,
+    "delivery_query": 0.05,
+    "chat": 0.0,
+}
+_HIGH_IMPORTANCE_KEYWORDS = (
+    "urgent", "rush", "failure", "exception", "delay",
+    "緊急", "趕工", "故障", "異常", "延遲",
+)
+# One alternation so keyword presence is found in a single scan of the content
+_KEYWORD_PATTERN = re.compile("|".join(map(re.escape, _HIGH_IMPORTANCE_KEYWORDS)))
+
 
 class MemoryService:
     """Manages the three-tier memory system: structured, episodic, and semantic."""
@@ -49,10 +67,12 @@ class MemoryService:
         db: AsyncSession,
         qdrant: AsyncQdrantClient,
         embedding_service: EmbeddingService | None = None,
+        upserter: AsyncBatchUpserter | None = None,
     ) -> None:
         self.db = db
         self.qdrant = qdrant
         self._embedding = embedding_service or EmbeddingService()
+        self._upserter = upserter
 
     # -------------------------------------------------------------------
     # Collection Setup
@@ -280,7 +300,7 @@ class MemoryService:
 
         results = await self.qdrant.query_points(
             collection_name=MEMORIES_COLLECTION,
-            query=vector,
+            query=vector.tolist(),
             query_filter=query_filter,
             limit=limit,
         )
@@ -372,24 +392,11 @@ class MemoryService:
         elif len(content) > 200:
             score += 0.05
 
-        # Category weights
-        category_weights: dict[str, float] = {
-            "scheduling": 0.15,
-            "rush_order": 0.2,
-            "exception": 0.2,
-            "simulation": 0.1,
-            "delivery_query": 0.05,
-            "chat": 0.0,
-        }
-        score += category_weights.get(category, 0.0)
-
-        # Keyword boosting
-        high_importance_keywords = ["urgent", "rush", "failure", "exception", "delay",
-                                     "緊急", "趕工", "故障", "異常", "延遲"]
-        content_lower = content.lower()
-        for keyword in high_importance_keywords:
-            if keyword in content_lower:
-                score += 0.05
+        score += _CATEGORY_WEIGHTS.get(category, 0.0)
+
+        # Keyword boosting: each distinct keyword counts once
+        keywords_found = set(_KEYWORD_PATTERN.findall(content.lower()))
+        score += 0.05 * len(keywords_found)
 
         return min(round(score, 3), 1.0)
 
@@ -407,25 +414,40 @@ class MemoryService:
         warm_cutoff = now - timedelta(days=HOT_THRESHOLD_DAYS)
         cold_cutoff = now - timedelta(days=WARM_THRESHOLD_DAYS)
 
-        # hot → warm
-        hot_to_warm = await self.db.execute(
+        # Both transitions run as data-modifying CTEs in one statement (one
+        # round trip). They share a snapshot, so hot entries already past the
+        # cold cutoff go straight to cold rather than waiting for the next run.
+        hot_to_warm = (
             update(MemoryEntry)
             .where(MemoryEntry.lifecycle == "hot")
             .where(MemoryEntry.created_at < warm_cutoff)
-            .values(lifecycle="warm")
-            .returning(func.count())
+            .values(
+                lifecycle=case(
+                    (MemoryEntry.created_at < cold_cutoff, "cold"), else_="warm",
+                )
+            )
+            .returning(MemoryEntry.lifecycle)
+            .cte("hot_to_warm")
         )
-        warm_count = hot_to_warm.scalar() or 0
-
-        # warm → cold
-        warm_to_cold = await self.db.execute(
+        warm_to_cold = (
             update(MemoryEntry)
             .where(MemoryEntry.lifecycle == "warm")
             .where(MemoryEntry.created_at < cold_cutoff)
             .values(lifecycle="cold")
-            .returning(func.count())
+            .returning(MemoryEntry.id)
+            .cte("warm_to_cold")
+        )
+        result = await self.db.execute(
+            select(
+                select(func.count()).select_from(hot_to_warm).scalar_subquery(),
+                select(func.count())
+                .select_from(hot_to_warm)
+                .where(hot_to_warm.c.lifecycle == "cold")
+                .scalar_subquery()
+                + select(func.count()).select_from(warm_to_cold).scalar_subquery(),
+            )
         )
-        cold_count = warm_to_cold.scalar() or 0
+        warm_count, cold_count = result.one()
 
         if warm_count or cold_count:
             logger.info(
@@ -445,19 +467,21 @@ class MemoryService:
         text: str,
         metadata: dict[str, Any],
     ) -> None:
-        """Generate an embedding for text and store it in Qdrant."""
+        """Generate an embedding for text and store it in Qdrant.
+
+        With an ``upserter`` the point is queued for a batched background
+        upsert; otherwise it is upserted immediately.
+        """
         try:
             vector = await self._embedding.embed_text(text)
-            await self.qdrant.upsert(
-                collection_name=MEMORIES_COLLECTION,
-                points=[
-                    PointStruct(
-                        id=point_id,
-                        vector=vector,
-                        payload=metadata,
-                    )
-                ],
-            )
+            point = PointStruct(id=point_id, vector=vector.tolist(), payload=metadata)
+            if self._upserter is not None:
+                self._upserter.add(point)
+            else:
+                await self.qdrant.upsert(
+                    collection_name=MEMORIES_COLLECTION,
+                    points=[point],
+                )
         except Exception as exc:
             logger.warning("Failed to store embedding for %s: %s", point_id, exc)
             # Non-critical: SQL data is still persisted even if vector storage fails
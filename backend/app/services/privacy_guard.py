@@ -7,6 +7,7 @@ to a local LLM for privacy-sensitive content.
 
 import logging
 import re
+import unicodedata
 from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
@@ -29,57 +30,97 @@ class _PIIPattern:
     mask: str
 
 
+# Matched in ASCII mode against NFKC-normalized text (see _normalize): full-width
+# digits and U+3000 spaces are folded to ASCII first, so \b, \d and \s only
+# need ASCII semantics, Chinese characters count as boundaries (catching
+# "身分證A123456789"), and the engine skips Unicode category lookups.
 _PII_PATTERNS: list[_PIIPattern] = [
     # Taiwan National ID: 1 letter + 9 digits (e.g., A123456789)
     _PIIPattern(
         name="tw_national_id",
-        pattern=re.compile(r"\b[A-Z][12]\d{8}\b"),
+        pattern=re.compile(r"\b[A-Z][12]\d{8}\b", re.ASCII),
         weight=0.9,
         mask="[身分證號已遮蔽]",
     ),
     # Taiwan Unified Business Number (統一編號): 8 digits
     _PIIPattern(
         name="tw_business_id",
-        pattern=re.compile(r"\b\d{8}\b(?=\s|$|[，。、）\)])"),
+        pattern=re.compile(r"\b\d{8}\b(?=\s|$|[,，。、）\)])", re.ASCII),
         weight=0.4,
         mask="[統編已遮蔽]",
     ),
     # Bank account numbers: 10-16 digits (common Taiwan formats)
     _PIIPattern(
         name="bank_account",
-        pattern=re.compile(r"\b\d{3}-?\d{2}-?\d{5,10}\b"),
+        pattern=re.compile(r"\b\d{3}-?\d{2}-?\d{5,10}\b", re.ASCII),
         weight=0.8,
         mask="[銀行帳號已遮蔽]",
     ),
     # Email addresses
     _PIIPattern(
         name="email",
-        pattern=re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b"),
+        pattern=re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b", re.ASCII),
         weight=0.5,
         mask="[電子郵件已遮蔽]",
     ),
     # Taiwan phone numbers: 09xx-xxx-xxx or 09xxxxxxxx or (0x)xxxx-xxxx
     _PIIPattern(
         name="phone_tw_mobile",
-        pattern=re.compile(r"\b09\d{2}-?\d{3}-?\d{3}\b"),
+        pattern=re.compile(r"\b09\d{2}-?\d{3}-?\d{3}\b", re.ASCII),
         weight=0.6,
         mask="[手機號碼已遮蔽]",
     ),
     _PIIPattern(
         name="phone_tw_landline",
-        pattern=re.compile(r"\(0\d{1,2}\)\s?\d{4}-?\d{4}"),
+        pattern=re.compile(r"\(0\d{1,2}\)\s?\d{4}-?\d{4}", re.ASCII),
         weight=0.5,
         mask="[電話號碼已遮蔽]",
     ),
     # Credit card numbers: 4 groups of 4 digits
     _PIIPattern(
         name="credit_card",
-        pattern=re.compile(r"\b\d{4}[- ]?\d{4}[- ]?\d{4}[- ]?\d{4}\b"),
+        pattern=re.compile(r"\b\d{4}[- ]?\d{4}[- ]?\d{4}[- ]?\d{4}\b", re.ASCII),
         weight=0.9,
         mask="[信用卡號已遮蔽]",
     ),
 ]
 
+# Masking precedence for the combined pattern below. One scan masks each span
+# once, so specific formats come before the generic digit runs that would
+# otherwise swallow them (a 09xx mobile number is also a bank account shape).
+_MASK_PRECEDENCE = (
+    "tw_national_id",
+    "credit_card",
+    "phone_tw_mobile",
+    "phone_tw_landline",
+    "email",
+    "bank_account",
+    "tw_business_id",
+)
+_PATTERNS_BY_NAME: dict[str, _PIIPattern] = {pii.name: pii for pii in _PII_PATTERNS}
+
+# All patterns unioned into one alternation of named groups, so sanitize()
+# masks in a single pass instead of one per pattern. Detection does not use
+# it: overlapping types (e.g. phone and bank account) must each be reported.
+_COMBINED_PATTERN = re.compile(
+    "|".join(
+        f"(?P<{name}>{_PATTERNS_BY_NAME[name].pattern.pattern})" for name in _MASK_PRECEDENCE
+    ),
+    re.ASCII,
+)
+_MASKS: dict[str, str] = {pii.name: pii.mask for pii in _PII_PATTERNS}
+
+
+def _normalize(text: str) -> str:
+    """Fold full-width forms to ASCII (NFKC) so the ASCII-mode patterns see them."""
+    return text if text.isascii() else unicodedata.normalize("NFKC", text)
+
+
+def _mask_match(match: re.Match[str]) -> str:
+    """Return the mask label for whichever PII pattern produced the match."""
+    assert match.lastgroup is not None
+    return _MASKS[match.lastgroup]
+
 
 @dataclass
 class PIIDetectionResult:
@@ -93,19 +134,17 @@ class PIIDetectionResult:
 class PrivacyGuard:
     """Service for detecting PII, scoring sensitivity, and sanitizing text."""
 
-    def __init__(self) -> None:
-        self._patterns = _PII_PATTERNS
-
     def detect(self, text: str) -> PIIDetectionResult:
         """Detect PII in the given text and return detection results."""
         if not text:
             return PIIDetectionResult()
 
+        text = _normalize(text)
         detected_types: list[str] = []
         max_weight = 0.0
         total_matches = 0
 
-        for pii in self._patterns:
+        for pii in _PII_PATTERNS:
             matches = pii.pattern.findall(text)
             if matches:
                 detected_types.append(pii.name)
@@ -126,15 +165,14 @@ class PrivacyGuard:
         )
 
     def sanitize(self, text: str) -> str:
-        """Mask all detected PII in the text, replacing with Chinese labels."""
+        """Mask all detected PII in the text, replacing with Chinese labels.
+
+        The result is NFKC-normalized, so full-width characters come back as ASCII.
+        """
         if not text:
             return text
 
-        result = text
-        for pii in self._patterns:
-            result = pii.pattern.sub(pii.mask, result)
-
-        return result
+        return _COMBINED_PATTERN.sub(_mask_match, _normalize(text))
 
     def should_use_local_llm(self, text: str) -> bool:
         """Decide whether to route to local LLM based on sensitivity score."""
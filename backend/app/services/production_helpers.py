@@ -64,27 +64,29 @@ async def fetch_active_lines(db: AsyncSession) -> list[ProductionLine]:
     return list(result.scalars().all())
 
 
+# Days to add to reach a weekday, indexed by date.weekday() (Mon=0 .. Sun=6):
+# staying on the same day if it is already a weekday, or moving to the next one
+_DAYS_TO_WEEKDAY = (0, 0, 0, 0, 0, 2, 1)
+_DAYS_TO_NEXT_WEEKDAY = (1, 1, 1, 1, 3, 2, 1)
+
+
 def _skip_to_next_workday(dt: datetime) -> datetime:
     """Advance to the start of the next working day (skip weekends)."""
-    result = (dt + timedelta(days=1)).replace(
+    return dt.replace(
         hour=DEFAULT_WORK_START_HOUR, minute=0, second=0, microsecond=0
-    )
-    while result.weekday() >= 5:
-        result += timedelta(days=1)
-    return result
+    ) + timedelta(days=_DAYS_TO_NEXT_WEEKDAY[dt.weekday()])
 
 
 def align_to_work_start(dt: datetime) -> datetime:
     """Align a datetime to the next available work start time."""
+    if dt.hour >= DEFAULT_WORK_END_HOUR:
+        return _skip_to_next_workday(dt)
     result = dt.replace(minute=0, second=0, microsecond=0)
     if result.hour < DEFAULT_WORK_START_HOUR:
         result = result.replace(hour=DEFAULT_WORK_START_HOUR)
-    elif result.hour >= DEFAULT_WORK_END_HOUR:
-        result = _skip_to_next_workday(result)
     # Skip weekends
-    while result.weekday() >= 5:
-        result += timedelta(days=1)
-    return result
+    days = _DAYS_TO_WEEKDAY[result.weekday()]
+    return result + timedelta(days=days) if days else result
 
 
 def calculate_job_overtime(start: datetime, end: datetime) -> float:
@@ -144,8 +146,8 @@ def calculate_production_time(
 def is_product_allowed_with_capabilities(
     product_sku: str,
     line: ProductionLine,
-    required_types: list[str] | None,
-    line_equipment_types: set[str] | None,
+    required_types: list[str] | frozenset[str] | None,
+    line_equipment_types: set[str] | frozenset[str] | None,
 ) -> bool:
     """Check if a product is allowed on a line, considering capability matrix.
 
@@ -163,8 +165,8 @@ def is_product_allowed_with_capabilities(
     if not required_types or line_equipment_types is None:
         return is_product_allowed(product_sku, line)
 
-    required_set = set(required_types)
-    return required_set.issubset(line_equipment_types)
+    # issuperset takes any iterable, so required_types needs no set copy
+    return line_equipment_types.issuperset(required_types)
 
 
 def advance_work_hours(start: datetime, hours: float) -> datetime:
@@ -182,8 +184,9 @@ def advance_work_hours(start: datetime, hours: float) -> datetime:
                 hour=DEFAULT_WORK_START_HOUR, minute=0, second=0, microsecond=0
             )
 
-        while current.weekday() >= 5:
-            current += timedelta(days=1)
+        days = _DAYS_TO_WEEKDAY[current.weekday()]
+        if days:
+            current += timedelta(days=days)
 
         day_end = current.replace(
             hour=DEFAULT_WORK_END_HOUR, minute=0, second=0, microsecond=0
@@ -0,0 +1,59 @@
+"""Write-coalescing buffer for Qdrant point upserts.
+
+Memory creation produces one embedding at a time; sending each as its own
+upsert RPC wastes a round trip per vector. AsyncBatchUpserter queues points
+and a background task upserts them in batches.
+"""
+
+import logging
+
+from qdrant_client.async_qdrant_client import AsyncQdrantClient
+from qdrant_client.models import PointStruct
+
+from app.services.batcher import BackgroundBatcher
+
+logger = logging.getLogger(__name__)
+
+# Defaults for the shared application upserter
+QDRANT_UPSERT_BATCH_SIZE = 64
+QDRANT_UPSERT_INTERVAL_SECONDS = 0.05
+QDRANT_UPSERT_QUEUE_SIZE = 10_000
+
+
+class AsyncBatchUpserter(BackgroundBatcher[PointStruct]):
+    """Buffers Qdrant points and upserts them in batches.
+
+    Callers add points without waiting on Qdrant; a background task drains
+    the queue and upserts up to ``batch_size`` points per request, waiting
+    at most ``interval_seconds`` for a batch to fill. Points are dropped
+    (and counted) when the queue is full rather than blocking the caller.
+    """
+
+    def __init__(
+        self,
+        qdrant: AsyncQdrantClient,
+        collection_name: str,
+        batch_size: int = QDRANT_UPSERT_BATCH_SIZE,
+        interval_seconds: float = QDRANT_UPSERT_INTERVAL_SECONDS,
+        max_queue: int = QDRANT_UPSERT_QUEUE_SIZE,
+    ) -> None:
+        super().__init__(self._upsert, batch_size, interval_seconds, max_queue)
+        self._qdrant = qdrant
+        self._collection_name = collection_name
+
+    def add(self, point: PointStruct) -> bool:
+        """Queue a point for the next batch. Returns False if it was dropped."""
+        if not self.put(point):
+            logger.warning(
+                "Qdrant upsert queue full, dropped point %s (total dropped=%d)",
+                point.id, self.dropped,
+            )
+            return False
+        return True
+
+    async def _upsert(self, points: list[PointStruct]) -> None:
+        """Upsert one batch in a single request."""
+        try:
+            await self._qdrant.upsert(collection_name=self._collection_name, points=points)
+        except Exception as exc:
+            logger.warning("Failed to upsert %d Qdrant point(s): %s", len(points), exc)
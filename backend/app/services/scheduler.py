@@ -6,6 +6,7 @@ Phase 3: AI optimization using historical data via LLM
 """
 
 import logging
+import operator
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
@@ -27,6 +28,7 @@ from app.services.production_helpers import (
     DEFAULT_WORK_START_HOUR,
     align_to_work_start,
     calculate_job_overtime,
+    calculate_production_time,
     fetch_active_lines,
     get_changeover_time,
     is_product_allowed,
@@ -34,12 +36,23 @@ from app.services.production_helpers import (
 
 logger = logging.getLogger(__name__)
 
+# Reference point for finish-time scores; only differences between scores matter
+_SCORE_EPOCH = datetime(2000, 1, 1, tzinfo=timezone.utc)
+# Phase 1 ordering: priority first, then earliest due date
+_PHASE1_SORT_KEY = operator.attrgetter("priority", "due_date")
+# Slack past the horizon a job may end in before a line is rejected
+_MAX_OVERTIME = timedelta(hours=DEFAULT_MAX_OVERTIME_HOURS)
+# Score per changeover minute: a base 1/10 penalty, eased for rush and
+# steepened for efficiency
+_CHANGEOVER_WEIGHT = {"rush": 1 / 10 - 1 / 20, "efficiency": 1 / 10 + 2.0}
+_DEFAULT_CHANGEOVER_WEIGHT = 1 / 10
+
 
 class SchedulingError(Exception):
     """Raised when scheduling encounters an unrecoverable error."""
 
 
-@dataclass
+@dataclass(slots=True)
 class _OrderTask:
     """Internal representation of a task to be scheduled."""
 
@@ -62,9 +75,16 @@ class _OrderTask:
 
 
 class _LineSlot:
-    """Tracks current state of a production line during scheduling."""
+    """Tracks current state of a production line during scheduling.
+
+    Also memoizes the line's product and changeover lookups. Slots live for
+    a single scheduling pass, over which the line configuration is fixed.
+    """
 
-    __slots__ = ("line", "current_time", "last_product_sku", "total_busy_hours", "overtime_hours")
+    __slots__ = (
+        "line", "current_time", "last_product_sku", "total_busy_hours", "overtime_hours",
+        "_allowed", "_changeovers",
+    )
 
     def __init__(self, line: ProductionLine, start_time: datetime) -> None:
         self.line = line
@@ -72,6 +92,25 @@ class _LineSlot:
         self.last_product_sku: str | None = None
         self.total_busy_hours: float = 0.0
         self.overtime_hours: float = 0.0
+        self._allowed: dict[str, bool] = {}
+        self._changeovers: dict[tuple[str | None, str], float] = {}
+
+    def allows(self, sku: str) -> bool:
+        """Whether the line may produce sku (see is_product_allowed)."""
+        allowed = self._allowed.get(sku)
+        if allowed is None:
+            allowed = self._allowed[sku] = is_product_allowed(sku, self.line)
+        return allowed
+
+    def changeover_to(self, sku: str) -> float:
+        """Changeover minutes from the line's last product to sku."""
+        key = (self.last_product_sku, sku)
+        minutes = self._changeovers.get(key)
+        if minutes is None:
+            minutes = self._changeovers[key] = get_changeover_time(
+                self.last_product_sku, sku, self.line
+            )
+        return minutes
 
 
 class SchedulerService:
@@ -207,7 +246,7 @@ class SchedulerService:
 
     def _phase1_rule_based_sort(self, tasks: list[_OrderTask]) -> list[_OrderTask]:
         """Sort tasks by priority (lower = higher priority), then by due date (earliest first)."""
-        return sorted(tasks, key=lambda t: (t.priority, t.due_date))
+        return sorted(tasks, key=_PHASE1_SORT_KEY)
 
     # ---------------------------------------------------------------
     # Phase 2: Constraint Satisfaction
@@ -306,35 +345,34 @@ class SchedulerService:
 
         Returns (slot, changeover_minutes) or (None, 0) if no slot fits.
         """
-        candidates: list[tuple[_LineSlot, float, float]] = []
+        latest_end = horizon_end + _MAX_OVERTIME
+        task_duration = timedelta(hours=task.estimated_hours)
+        best: tuple[_LineSlot | None, float] = (None, 0.0)
+        best_score = float("inf")
+        # Bound once; this loop runs for every (task, line) pair
+        sku = task.product_sku
+        score_assignment = self._score_assignment
 
         for slot in slots:
             # Check if product is allowed on this line
-            if not is_product_allowed(task.product_sku, slot.line):
+            if not slot.allows(sku):
                 continue
 
-            changeover = get_changeover_time(
-                slot.last_product_sku, task.product_sku, slot.line
-            )
+            changeover = slot.changeover_to(sku)
 
             # Estimate finish time
-            job_start = slot.current_time + timedelta(minutes=changeover)
-            job_end = job_start + timedelta(hours=task.estimated_hours)
+            job_end = slot.current_time + timedelta(minutes=changeover) + task_duration
 
-            if job_end > horizon_end + timedelta(hours=DEFAULT_MAX_OVERTIME_HOURS):
+            if job_end > latest_end:
                 continue
 
-            # Score: lower is better
-            score = self._score_assignment(task, slot, changeover, job_end, strategy)
-            candidates.append((slot, changeover, score))
+            # Score: lower is better; strict < keeps the first line on ties
+            score = score_assignment(task, slot, changeover, job_end, strategy)
+            if score < best_score:
+                best = (slot, changeover)
+                best_score = score
 
-        if not candidates:
-            return None, 0.0
-
-        # Pick best scoring candidate
-        candidates.sort(key=lambda c: c[2])
-        best = candidates[0]
-        return best[0], best[1]
+        return best
 
     def _score_assignment(
         self,
@@ -346,25 +384,17 @@ class SchedulerService:
     ) -> float:
         """Score a line assignment. Lower is better."""
         # Base: earliest finish time
-        finish_delta = (job_end - datetime(2000, 1, 1, tzinfo=timezone.utc)).total_seconds()
+        finish_delta = (job_end - _SCORE_EPOCH).total_seconds()
         score = finish_delta / 3600.0  # Normalize to hours
 
-        # Penalty for changeover
-        score += changeover / 10.0
+        # Penalty for changeover, weighted by strategy
+        score += changeover * _CHANGEOVER_WEIGHT.get(strategy, _DEFAULT_CHANGEOVER_WEIGHT)
 
         # Penalty for late delivery
         if job_end > task.due_date:
             late_hours = (job_end - task.due_date).total_seconds() / 3600.0
             score += late_hours * 100.0  # Heavy penalty
 
-        # Strategy adjustments
-        if strategy == "rush":
-            # Minimize finish time even more
-            score -= changeover / 20.0  # Less penalty for changeover
-        elif strategy == "efficiency":
-            # Minimize changeover more
-            score += changeover * 2.0
-
         # Prefer lines with less load (balance)
         score += slot.total_busy_hours * 0.5
 
@@ -588,8 +618,6 @@ class SchedulerService:
         Returns:
             Estimated production hours (including setup).
         """
-        from app.services.production_helpers import calculate_production_time
-
         prod_minutes = calculate_production_time(steps, quantity, yield_rate, efficiency_factor)
         return (prod_minutes + setup_time_min) / 60.0
 
@@ -39,7 +39,7 @@ class SimulationError(Exception):
     """Raised when simulation encounters an unrecoverable error."""
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RushOrderInput:
     """Input parameters for a rush order simulation."""
 
@@ -49,7 +49,7 @@ class RushOrderInput:
     priority: int = 1  # Rush orders default to highest priority
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AffectedOrder:
     """An existing order impacted by rush order insertion."""
 
@@ -59,7 +59,7 @@ class AffectedOrder:
     delay_minutes: float
 
 
-@dataclass
+@dataclass(slots=True)
 class SimulationScenario:
     """A single feasible scenario for rush order insertion."""
 
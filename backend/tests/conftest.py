@@ -1,6 +1,9 @@
 """Pytest configuration with fixtures for async testing."""
 
+import functools
 import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 from typing import Any
 from unittest.mock import AsyncMock, MagicMock
@@ -23,7 +26,16 @@ def _make_mock(defaults: dict[str, Any], overrides: dict[str, Any]) -> MagicMock
     return mock
 
 
-class ProductFactory:
+class _BatchFactory:
+    """Adds ``create_batch`` to the mock factories below."""
+
+    @classmethod
+    def create_batch(cls, n: int, **overrides: Any) -> list[MagicMock]:
+        """Create ``n`` instances sharing the same overrides."""
+        return [cls.create(**overrides) for _ in range(n)]
+
+
+class ProductFactory(_BatchFactory):
     """Factory for creating Product instances for testing."""
 
     _counter = 0
@@ -46,7 +58,7 @@ class ProductFactory:
         return _make_mock(defaults, overrides)
 
 
-class ProductionLineFactory:
+class ProductionLineFactory(_BatchFactory):
     """Factory for creating ProductionLine instances for testing."""
 
     _counter = 0
@@ -69,7 +81,7 @@ class ProductionLineFactory:
         return _make_mock(defaults, overrides)
 
 
-class OrderFactory:
+class OrderFactory(_BatchFactory):
     """Factory for creating Order instances for testing."""
 
     _counter = 0
@@ -96,7 +108,7 @@ class OrderFactory:
         return _make_mock(defaults, overrides)
 
 
-class OrderItemFactory:
+class OrderItemFactory(_BatchFactory):
     """Factory for creating OrderItem instances for testing."""
 
     @classmethod
@@ -112,26 +124,32 @@ class OrderItemFactory:
         return _make_mock(defaults, overrides)
 
 
-class ScheduledJobFactory:
+# Fields that never vary between ScheduledJobFactory calls
+_JOB_STATIC_DEFAULTS: dict[str, Any] = {
+    "quantity": 100,
+    "changeover_time": 0.0,
+    "status": "planned",
+    "notes": None,
+    "product": None,
+}
+
+
+class ScheduledJobFactory(_BatchFactory):
     """Factory for creating ScheduledJob instances for testing."""
 
     @classmethod
     def create(cls, **overrides: Any) -> MagicMock:
         now = datetime.now(timezone.utc)
         defaults = {
+            **_JOB_STATIC_DEFAULTS,
             "id": uuid.uuid4(),
             "order_item_id": uuid.uuid4(),
             "production_line_id": uuid.uuid4(),
             "product_id": uuid.uuid4(),
             "planned_start": now,
             "planned_end": now + timedelta(hours=2),
-            "quantity": 100,
-            "changeover_time": 0.0,
-            "status": "planned",
-            "notes": None,
             "created_at": now,
             "updated_at": now,
-            "product": None,
         }
         return _make_mock(defaults, overrides)
 
@@ -187,6 +205,17 @@ def mock_db():
     return session
 
 
+@pytest.fixture(scope="session")
+def model_columns():
+    """Provide a cached lookup of an ORM model's mapped column names."""
+
+    @functools.cache
+    def _columns(model: type) -> frozenset[str]:
+        return frozenset(c.key for c in model.__mapper__.columns)
+
+    return _columns
+
+
 @pytest.fixture
 def mock_llm_response():
     """Provide a factory for mock LLM responses."""
@@ -204,6 +233,26 @@ def mock_llm_response():
     return _make
 
 
+@contextmanager
+def _llm_failure(
+    mock_llm: AsyncMock,
+    exc: Exception | None = None,
+) -> Iterator[AsyncMock]:
+    """Temporarily make ``mock_llm.call`` raise, restoring the previous side_effect on exit."""
+    original = mock_llm.call.side_effect
+    mock_llm.call.side_effect = exc or RuntimeError("All providers failed")
+    try:
+        yield mock_llm
+    finally:
+        mock_llm.call.side_effect = original
+
+
+@pytest.fixture
+def llm_failure():
+    """Provide a context manager that makes a mock LLM router fail inside its block."""
+    return _llm_failure
+
+
 @pytest.fixture
 def sample_product(product_factory):
     """A single product with standard settings."""
@@ -244,7 +293,7 @@ def sample_order(order_factory, order_item_factory, sample_product):
 # ---------------------------------------------------------------------------
 
 
-class ProcessStationFactory:
+class ProcessStationFactory(_BatchFactory):
     """Factory for creating ProcessStation mock instances."""
 
     _counter = 0
@@ -269,7 +318,7 @@ class ProcessStationFactory:
         return _make_mock(defaults, overrides)
 
 
-class ProcessRouteFactory:
+class ProcessRouteFactory(_BatchFactory):
     """Factory for creating ProcessRoute mock instances."""
 
     _counter = 0
@@ -295,7 +344,7 @@ class ProcessRouteFactory:
         return _make_mock(defaults, overrides)
 
 
-class LineCapabilityFactory:
+class LineCapabilityFactory(_BatchFactory):
     """Factory for creating LineCapabilityMatrix mock instances."""
 
     _counter = 0
@@ -0,0 +1,47 @@
+"""Lightweight stand-ins for SQLAlchemy objects used across tests."""
+
+import itertools
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+# Sequential ids for tests that need unique UUIDs but not random ones
+_uuid_counter = itertools.count(1)
+
+
+def fake_uuid() -> uuid.UUID:
+    """Return a unique, deterministic UUID without touching the OS RNG."""
+    return uuid.UUID(int=next(_uuid_counter))
+
+
+@dataclass(slots=True)
+class FakeResult:
+    """Minimal ``Result`` replacement returned from a mocked ``session.execute``."""
+
+    rows: list[Any] = field(default_factory=list)
+
+    def scalars(self) -> "FakeResult":
+        return self
+
+    def all(self) -> list[Any]:
+        return self.rows
+
+    def scalar_one_or_none(self) -> Any:
+        return self.rows[0] if self.rows else None
+
+
+class FakeAsyncSession:
+    """``AsyncSession`` stand-in whose ``execute`` replays queued results in order.
+
+    Only covers code paths that read through ``execute``; anything else should
+    use the ``mock_db`` fixture.
+    """
+
+    __slots__ = ("results",)
+
+    def __init__(self, *results: FakeResult) -> None:
+        self.results: deque[FakeResult] = deque(results)
+
+    async def execute(self, stmt: Any) -> FakeResult:
+        return self.results.popleft()
@@ -1,15 +1,19 @@
 """Tests for ChatService: context building, LLM response handling, memory updates."""
 
-import uuid
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
 from app.schemas.chat import ChatRequest, ChatResponse
-from app.services.chat_service import ChatService, SYSTEM_PROMPT, MAX_CONTEXT_TOKENS
+from app.services.chat_service import ChatService
 from app.services.llm_router import LLMResponse
 from app.services.privacy_guard import PrivacyGuard
 
+# Shared read-only requests; handle_message never mutates its input
+_REQ_TEST = ChatRequest(message="test")
+_REQ_QUESTION = ChatRequest(message="test question")
+_REQ_PII = ChatRequest(message="客戶身分證 A123456789")
+
 
 # ---------------------------------------------------------------------------
 # ChatService Unit Tests
@@ -19,6 +23,8 @@ from app.services.privacy_guard import PrivacyGuard
 class TestChatService:
     """Test ChatService.handle_message orchestration."""
 
+    pytestmark = pytest.mark.asyncio(scope="class")
+
     @pytest.fixture
     def mock_llm(self):
         llm = AsyncMock()
@@ -56,7 +62,6 @@ class TestChatService:
             privacy_guard=PrivacyGuard(),
         )
 
-    @pytest.mark.asyncio
     async def test_handle_message_returns_chat_response(self, chat_service):
         """handle_message returns a ChatResponse with reply."""
         request = ChatRequest(message="訂單何時交貨？")
@@ -64,53 +69,46 @@ class TestChatService:
         assert isinstance(response, ChatResponse)
         assert response.reply == "AI回覆測試"
 
-    @pytest.mark.asyncio
     async def test_handle_message_generates_conversation_id(self, chat_service):
         """A new conversation_id is generated when not provided."""
-        request = ChatRequest(message="test")
+        request = _REQ_TEST
         response = await chat_service.handle_message(request)
         assert response.conversation_id is not None
         assert len(response.conversation_id) > 0
 
-    @pytest.mark.asyncio
     async def test_handle_message_preserves_conversation_id(self, chat_service):
         """Provided conversation_id is preserved."""
         request = ChatRequest(message="test", conversation_id="conv-123")
         response = await chat_service.handle_message(request)
         assert response.conversation_id == "conv-123"
 
-    @pytest.mark.asyncio
     async def test_handle_message_calls_llm(self, chat_service, mock_llm):
         """handle_message calls LLM router."""
-        request = ChatRequest(message="test question")
+        request = _REQ_QUESTION
         await chat_service.handle_message(request)
         mock_llm.call.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_handle_message_stores_memory(self, chat_service, mock_memory):
         """handle_message stores conversation as episodic memory."""
-        request = ChatRequest(message="test question")
+        request = _REQ_QUESTION
         await chat_service.handle_message(request)
         mock_memory.create_decision.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_handle_message_llm_failure_returns_fallback(self, chat_service, mock_llm):
+    async def test_handle_message_llm_failure_returns_fallback(self, chat_service, mock_llm, llm_failure):
         """LLM failure returns fallback message instead of raising."""
-        mock_llm.call.side_effect = RuntimeError("All providers failed")
-        request = ChatRequest(message="test")
-        response = await chat_service.handle_message(request)
+        request = _REQ_TEST
+        with llm_failure(mock_llm):
+            response = await chat_service.handle_message(request)
         assert "抱歉" in response.reply
         assert response.metadata.get("fallback") is True
 
-    @pytest.mark.asyncio
     async def test_handle_message_memory_failure_non_fatal(self, chat_service, mock_memory):
         """Memory storage failure doesn't break the response."""
         mock_memory.create_decision.side_effect = Exception("DB error")
-        request = ChatRequest(message="test")
+        request = _REQ_TEST
         response = await chat_service.handle_message(request)
         assert response.reply == "AI回覆測試"
 
-    @pytest.mark.asyncio
     async def test_handle_message_with_extra_context(self, chat_service, mock_llm):
         """Extra context from request is included in LLM call."""
         request = ChatRequest(message="test", context={"order_id": "ORD-001"})
@@ -118,25 +116,11 @@ class TestChatService:
         call_kwargs = mock_llm.call.call_args
         assert "ORD-001" in call_kwargs.kwargs.get("prompt", "") or "ORD-001" in str(call_kwargs)
 
-    @pytest.mark.asyncio
-    async def test_privacy_sensitive_message_uses_local(self, mock_db, mock_llm, mock_memory):
+    async def test_privacy_sensitive_message_uses_local(self, chat_service, mock_llm):
         """Messages with PII trigger local LLM preference."""
-        # mock_db.execute needs to return sync .scalars().all() for internal queries
-        mock_scalars = MagicMock()
-        mock_scalars.all.return_value = []
-        mock_execute_result = MagicMock()
-        mock_execute_result.scalars.return_value = mock_scalars
-        mock_db.execute.return_value = mock_execute_result
-
-        service = ChatService(
-            db=mock_db,
-            llm_router=mock_llm,
-            memory_service=mock_memory,
-            privacy_guard=PrivacyGuard(),
-        )
         # Taiwan national ID triggers high sensitivity
-        request = ChatRequest(message="客戶身分證 A123456789")
-        await service.handle_message(request)
+        request = _REQ_PII
+        await chat_service.handle_message(request)
         call_kwargs = mock_llm.call.call_args
         assert call_kwargs.kwargs.get("prefer_local") is True
 
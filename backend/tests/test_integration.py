@@ -10,6 +10,7 @@ import uuid
 from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import numpy as np
 import pytest
 
 from app.schemas.chat import ChatRequest, ChatResponse
@@ -20,6 +21,10 @@ from app.services.memory_service import MemoryService
 from app.services.privacy_guard import PrivacyGuard
 from app.services.scheduler import SchedulerService
 
+# Shared read-only requests; handle_message never mutates its input
+_REQ_TEST = ChatRequest(message="test")
+_REQ_PII = ChatRequest(message="客戶身分證 A123456789")
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -49,6 +54,12 @@ def _make_chat_mock_db():
     return mock_db
 
 
+@pytest.fixture
+def chat_db():
+    """Fresh chat mock DB per test, so no configuration leaks between tests."""
+    return _make_chat_mock_db()
+
+
 # ---------------------------------------------------------------------------
 # Chat -> LLM -> Memory Integration
 # ---------------------------------------------------------------------------
@@ -57,6 +68,8 @@ def _make_chat_mock_db():
 class TestChatLLMMemoryIntegration:
     """Test the full chat pipeline: message -> LLM call -> memory storage."""
 
+    pytestmark = pytest.mark.asyncio(scope="class")
+
     @pytest.fixture
     def mock_llm(self):
         llm = AsyncMock()
@@ -78,16 +91,14 @@ class TestChatLLMMemoryIntegration:
         return mem
 
     @pytest.fixture
-    def chat_service(self, mock_llm, mock_memory):
-        db = _make_chat_mock_db()
+    def chat_service(self, chat_db, mock_llm, mock_memory):
         return ChatService(
-            db=db,
+            db=chat_db,
             llm_router=mock_llm,
             memory_service=mock_memory,
             privacy_guard=PrivacyGuard(),
         )
 
-    @pytest.mark.asyncio
     async def test_chat_stores_decision_after_response(self, chat_service, mock_memory):
         """After receiving LLM response, conversation is stored as decision."""
         request = ChatRequest(message="下週的訂單排程如何？")
@@ -101,45 +112,33 @@ class TestChatLLMMemoryIntegration:
         assert call_kwargs["decision_type"] == "chat"
         assert "下週的訂單排程如何" in call_kwargs["situation"]
 
-    @pytest.mark.asyncio
     async def test_chat_includes_llm_metadata(self, chat_service):
         """Response metadata includes LLM provider info."""
-        request = ChatRequest(message="test")
+        request = _REQ_TEST
         response = await chat_service.handle_message(request)
 
         assert response.metadata["provider"] == "claude"
         assert response.metadata["input_tokens"] == 150
         assert response.metadata["output_tokens"] == 80
 
-    @pytest.mark.asyncio
-    async def test_chat_memory_failure_non_fatal(self, mock_llm, mock_memory):
+    async def test_chat_memory_failure_non_fatal(self, chat_db, mock_llm, mock_memory):
         """Memory storage failure does not affect the chat response."""
         mock_memory.create_decision.side_effect = Exception("DB connection lost")
 
-        db = _make_chat_mock_db()
         service = ChatService(
-            db=db, llm_router=mock_llm,
+            db=chat_db, llm_router=mock_llm,
             memory_service=mock_memory, privacy_guard=PrivacyGuard(),
         )
 
-        request = ChatRequest(message="test")
+        request = _REQ_TEST
         response = await service.handle_message(request)
         assert response.reply == "排程建議回覆"
 
-    @pytest.mark.asyncio
-    async def test_chat_llm_failure_returns_fallback(self, mock_memory):
+    async def test_chat_llm_failure_returns_fallback(self, chat_service, mock_llm, llm_failure):
         """LLM failure returns a fallback message."""
-        mock_llm = AsyncMock()
-        mock_llm.call.side_effect = RuntimeError("All providers failed")
-
-        db = _make_chat_mock_db()
-        service = ChatService(
-            db=db, llm_router=mock_llm,
-            memory_service=mock_memory, privacy_guard=PrivacyGuard(),
-        )
-
-        request = ChatRequest(message="test")
-        response = await service.handle_message(request)
+        request = _REQ_TEST
+        with llm_failure(mock_llm):
+            response = await chat_service.handle_message(request)
 
         assert "抱歉" in response.reply
         assert response.metadata.get("fallback") is True
@@ -153,6 +152,8 @@ class TestChatLLMMemoryIntegration:
 class TestPrivacyChatIntegration:
     """Test privacy-aware routing in the chat pipeline."""
 
+    pytestmark = pytest.mark.asyncio(scope="class")
+
     @pytest.fixture
     def mock_llm(self):
         llm = AsyncMock()
@@ -171,12 +172,10 @@ class TestPrivacyChatIntegration:
         mem.create_decision = AsyncMock()
         return mem
 
-    @pytest.mark.asyncio
-    async def test_pii_triggers_local_llm(self, mock_llm, mock_memory):
+    async def test_pii_triggers_local_llm(self, chat_db, mock_llm, mock_memory):
         """Messages with PII (national ID) should use local LLM."""
-        db = _make_chat_mock_db()
         service = ChatService(
-            db=db, llm_router=mock_llm,
+            db=chat_db, llm_router=mock_llm,
             memory_service=mock_memory, privacy_guard=PrivacyGuard(),
         )
 
@@ -186,12 +185,10 @@ class TestPrivacyChatIntegration:
         call_kwargs = mock_llm.call.call_args.kwargs
         assert call_kwargs.get("prefer_local") is True
 
-    @pytest.mark.asyncio
-    async def test_no_pii_uses_cloud_llm(self, mock_llm, mock_memory):
+    async def test_no_pii_uses_cloud_llm(self, chat_db, mock_llm, mock_memory):
         """Messages without PII should use cloud LLM."""
-        db = _make_chat_mock_db()
         service = ChatService(
-            db=db, llm_router=mock_llm,
+            db=chat_db, llm_router=mock_llm,
             memory_service=mock_memory, privacy_guard=PrivacyGuard(),
         )
 
@@ -201,16 +198,14 @@ class TestPrivacyChatIntegration:
         call_kwargs = mock_llm.call.call_args.kwargs
         assert call_kwargs.get("prefer_local") is False
 
-    @pytest.mark.asyncio
-    async def test_pii_sanitized_before_llm(self, mock_llm, mock_memory):
+    async def test_pii_sanitized_before_llm(self, chat_db, mock_llm, mock_memory):
         """PII should be masked before sending to LLM."""
-        db = _make_chat_mock_db()
         service = ChatService(
-            db=db, llm_router=mock_llm,
+            db=chat_db, llm_router=mock_llm,
             memory_service=mock_memory, privacy_guard=PrivacyGuard(),
         )
 
-        request = ChatRequest(message="客戶身分證 A123456789")
+        request = _REQ_PII
         await service.handle_message(request)
 
         call_kwargs = mock_llm.call.call_args.kwargs
@@ -226,7 +221,8 @@ class TestPrivacyChatIntegration:
 class TestSchedulerEndToEnd:
     """Test scheduler from request to result."""
 
-    @pytest.mark.asyncio
+    pytestmark = pytest.mark.asyncio(scope="class")
+
     async def test_generate_schedule_with_no_orders(self, mock_db):
         """Empty database returns warning about no orders."""
         svc = SchedulerService(mock_db)
@@ -241,7 +237,6 @@ class TestSchedulerEndToEnd:
         assert result.total_jobs == 0
         assert len(result.warnings) > 0
 
-    @pytest.mark.asyncio
     async def test_generate_schedule_with_no_lines(self, mock_db):
         """No production lines returns appropriate warning."""
         svc = SchedulerService(mock_db)
@@ -276,15 +271,18 @@ class TestSchedulerEndToEnd:
 class TestMemoryLifecycleIntegration:
     """Test memory creation through lifecycle transitions."""
 
+    pytestmark = pytest.mark.asyncio(scope="class")
+
     @pytest.fixture
     def memory_service(self, mock_db):
         mock_qdrant = AsyncMock()
         mock_embedding = AsyncMock()
-        mock_embedding.embed_text = AsyncMock(return_value=[0.1] * 1536)
+        mock_embedding.embed_text = AsyncMock(
+            return_value=np.full(1536, 0.1, dtype=np.float32)
+        )
         mock_qdrant.upsert = AsyncMock()
         return MemoryService(db=mock_db, qdrant=mock_qdrant, embedding_service=mock_embedding)
 
-    @pytest.mark.asyncio
     async def test_new_memory_starts_as_hot(self, memory_service, mock_db):
         """Newly created memories have lifecycle='hot'."""
         await memory_service.create_memory(
@@ -297,7 +295,6 @@ class TestMemoryLifecycleIntegration:
         added_obj = mock_db.add.call_args[0][0]
         assert added_obj.lifecycle == "hot"
 
-    @pytest.mark.asyncio
     async def test_memory_importance_calculated(self, memory_service, mock_db):
         """Memory importance is auto-calculated on creation."""
         await memory_service.create_memory(
@@ -309,7 +306,6 @@ class TestMemoryLifecycleIntegration:
         added_obj = mock_db.add.call_args[0][0]
         assert added_obj.importance > 0.5
 
-    @pytest.mark.asyncio
     async def test_episodic_memory_stored_in_qdrant(self, memory_service):
         """Episodic memories are also stored in vector DB."""
         await memory_service.create_memory(
@@ -319,7 +315,6 @@ class TestMemoryLifecycleIntegration:
         )
         memory_service.qdrant.upsert.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_structured_memory_not_in_qdrant(self, memory_service):
         """Structured memories are NOT stored in vector DB."""
         await memory_service.create_memory(
@@ -5,6 +5,15 @@ from datetime import datetime, timezone
 
 from app.schemas.line_capability import LineCapabilityCreate, LineCapabilityResponse
 
+_NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+_FULL_CREATE_PAYLOAD = {
+    "production_line_id": uuid.uuid4(),
+    "equipment_type": "SMT",
+    "capability_params": {"max_speed_rpm": 3000},
+    "throughput_range": {"min_units_per_hour": 50, "max_units_per_hour": 120},
+}
+
 
 class TestLineCapabilityCreate:
     def test_valid_minimal(self):
@@ -16,24 +25,19 @@ class TestLineCapabilityCreate:
         assert lc.throughput_range is None
 
     def test_with_all_fields(self):
-        lc = LineCapabilityCreate(
-            production_line_id=uuid.uuid4(),
-            equipment_type="SMT",
-            capability_params={"max_speed_rpm": 3000},
-            throughput_range={"min_units_per_hour": 50, "max_units_per_hour": 120},
-        )
+        lc = LineCapabilityCreate.model_validate(_FULL_CREATE_PAYLOAD)
         assert lc.capability_params["max_speed_rpm"] == 3000
+        assert lc.throughput_range["max_units_per_hour"] == 120
 
 
 class TestLineCapabilityResponse:
     def test_from_attributes(self):
-        now = datetime.now(timezone.utc)
         r = LineCapabilityResponse(
             id=uuid.uuid4(),
             production_line_id=uuid.uuid4(),
             equipment_type="SMT",
             capability_params=None,
             throughput_range=None,
-            updated_at=now,
+            updated_at=_NOW,
         )
         assert r.equipment_type == "SMT"
@@ -1,10 +1,12 @@
 """Tests for LLMRouter: fallback chain, provider failures, usage logging, response normalization."""
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from app.services.llm_router import LLMRouter, LLMResponse, DEFAULT_CLAUDE_MODEL, DEFAULT_OPENAI_MODEL, DEFAULT_OLLAMA_MODEL
+from app.services.llm_cache import TIME_SENSITIVE_PATTERNS, LLMCache, MemoryBackend, SemanticCache
+from app.services.llm_router import LLMClients, LLMConfig, LLMRouter, LLMResponse, DEFAULT_CLAUDE_MODEL, DEFAULT_OPENAI_MODEL, DEFAULT_OLLAMA_MODEL
 
 
 # ---------------------------------------------------------------------------
@@ -22,6 +24,13 @@ class TestLLMResponse:
         assert resp.latency_ms == 0.0
         assert resp.metadata == {}
 
+    def test_immutable_and_hashable(self):
+        resp = LLMResponse(content="hello", provider="claude", model="test", metadata={"k": 1})
+        with pytest.raises(AttributeError):
+            resp.content = "changed"
+        assert not hasattr(resp, "__dict__")
+        assert hash(resp) == hash(LLMResponse(content="hello", provider="claude", model="test"))
+
     def test_all_fields(self):
         resp = LLMResponse(
             content="reply",
@@ -37,6 +46,21 @@ class TestLLMResponse:
         assert resp.input_tokens == 100
 
 
+# Canned provider responses shared by the router tests (LLMResponse is frozen)
+_CLAUDE_OK = LLMResponse(
+    content="claude response", provider="claude", model=DEFAULT_CLAUDE_MODEL,
+    input_tokens=10, output_tokens=5, latency_ms=100.0,
+)
+_OPENAI_OK = LLMResponse(
+    content="openai response", provider="openai", model=DEFAULT_OPENAI_MODEL,
+    input_tokens=10, output_tokens=5, latency_ms=150.0,
+)
+_OLLAMA_OK = LLMResponse(
+    content="ollama response", provider="ollama", model=DEFAULT_OLLAMA_MODEL,
+    input_tokens=10, output_tokens=5, latency_ms=200.0,
+)
+
+
 # ---------------------------------------------------------------------------
 # Fallback Chain Tests
 # ---------------------------------------------------------------------------
@@ -47,25 +71,10 @@ class TestFallbackChain:
 
     @pytest.fixture
     def router(self):
-        """Router with mocked clients."""
-        with patch("app.services.llm_router.settings") as mock_settings:
-            mock_settings.ANTHROPIC_API_KEY = "test-key"
-            mock_settings.OPENAI_API_KEY = "test-key"
-            mock_settings.OLLAMA_BASE_URL = "http://localhost:11434"
-            router = LLMRouter()
-        # Replace internal call methods with mocks
-        router._call_claude = AsyncMock(return_value=LLMResponse(
-            content="claude response", provider="claude", model=DEFAULT_CLAUDE_MODEL,
-            input_tokens=10, output_tokens=5, latency_ms=100.0,
-        ))
-        router._call_openai = AsyncMock(return_value=LLMResponse(
-            content="openai response", provider="openai", model=DEFAULT_OPENAI_MODEL,
-            input_tokens=10, output_tokens=5, latency_ms=150.0,
-        ))
-        router._call_ollama = AsyncMock(return_value=LLMResponse(
-            content="ollama response", provider="ollama", model=DEFAULT_OLLAMA_MODEL,
-            input_tokens=10, output_tokens=5, latency_ms=200.0,
-        ))
+        router = LLMRouter(LLMConfig(anthropic_api_key="test-key", openai_api_key="test-key"))
+        router._call_claude = AsyncMock(return_value=_CLAUDE_OK)
+        router._call_openai = AsyncMock(return_value=_OPENAI_OK)
+        router._call_ollama = AsyncMock(return_value=_OLLAMA_OK)
         return router
 
     @pytest.mark.asyncio
@@ -114,6 +123,91 @@ class TestFallbackChain:
         result = await router.call(prompt="test", prefer_local=True)
         assert result.provider == "claude"
 
+    @pytest.mark.asyncio
+    async def test_hedged_fast_primary_skips_backup(self, router):
+        """A hedged call whose primary answers within the stagger never starts the backup."""
+        result = await router.call(prompt="test", hedge=True, use_cache=False)
+        assert result.provider == "claude"
+        router._call_openai.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_hedged_slow_primary_loses_race(self, router):
+        """A slow primary is overtaken by the backup and then cancelled."""
+        cancelled = asyncio.Event()
+
+        async def slow_claude(*args, **kwargs):
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        router._call_claude.side_effect = slow_claude
+        result = await router.call(prompt="test", hedge=True, stagger_ms=10, use_cache=False)
+        assert result.provider == "openai"
+        assert cancelled.is_set()
+
+    @pytest.mark.asyncio
+    async def test_hedged_failure_starts_backup_immediately(self, router):
+        """A failing provider triggers the next one without waiting for the stagger."""
+        router._call_claude.side_effect = Exception("Claude down")
+        result = await asyncio.wait_for(
+            router.call(prompt="test", hedge=True, stagger_ms=10_000, use_cache=False),
+            timeout=1,
+        )
+        assert result.provider == "openai"
+        failures = router.get_recent_failures()
+        assert [f["provider"] for f in failures] == ["claude"]
+
+    @pytest.mark.asyncio
+    async def test_hedged_race_excludes_ollama(self, router):
+        """Only cloud providers are raced; Ollama is not started while they are in flight."""
+        async def slow_claude(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            return _CLAUDE_OK
+
+        async def slow_openai(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            return _OPENAI_OK
+
+        router._call_claude.side_effect = slow_claude
+        router._call_openai.side_effect = slow_openai
+        result = await router.call(prompt="test", hedge=True, stagger_ms=10, use_cache=False)
+        assert result.provider in ("claude", "openai")
+        router._call_ollama.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_hedged_falls_back_to_ollama(self, router):
+        """When every raced cloud provider fails, Ollama still answers."""
+        router._call_claude.side_effect = Exception("Claude down")
+        router._call_openai.side_effect = Exception("OpenAI down")
+        result = await router.call(prompt="test", hedge=True, stagger_ms=10, use_cache=False)
+        assert result.provider == "ollama"
+
+    @pytest.mark.asyncio
+    async def test_hedge_ignored_when_prefer_local(self, router):
+        """A slow local answer is awaited rather than raced against the cloud."""
+        async def slow_ollama(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            return _OLLAMA_OK
+
+        router._call_ollama.side_effect = slow_ollama
+        result = await router.call(
+            prompt="test", prefer_local=True, hedge=True, stagger_ms=10, use_cache=False,
+        )
+        assert result.provider == "ollama"
+        router._call_claude.assert_not_called()
+        router._call_openai.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_hedged_all_fail_raises(self, router):
+        """Hedged calls raise the same error as the serial chain when all providers fail."""
+        router._call_claude.side_effect = Exception("Claude down")
+        router._call_openai.side_effect = Exception("OpenAI down")
+        router._call_ollama.side_effect = Exception("Ollama down")
+        with pytest.raises(RuntimeError, match="All LLM providers failed"):
+            await router.call(prompt="test", hedge=True, stagger_ms=10)
+
 
 # ---------------------------------------------------------------------------
 # Usage Logging Tests
@@ -125,15 +219,8 @@ class TestUsageLogging:
 
     @pytest.fixture
     def router(self):
-        with patch("app.services.llm_router.settings") as mock_settings:
-            mock_settings.ANTHROPIC_API_KEY = "test-key"
-            mock_settings.OPENAI_API_KEY = "test-key"
-            mock_settings.OLLAMA_BASE_URL = "http://localhost:11434"
-            router = LLMRouter()
-        router._call_claude = AsyncMock(return_value=LLMResponse(
-            content="ok", provider="claude", model=DEFAULT_CLAUDE_MODEL,
-            input_tokens=100, output_tokens=50, latency_ms=200.0,
-        ))
+        router = LLMRouter(LLMConfig(anthropic_api_key="test-key", openai_api_key="test-key"))
+        router._call_claude = AsyncMock(return_value=_CLAUDE_OK)
         return router
 
     @pytest.mark.asyncio
@@ -146,16 +233,11 @@ class TestUsageLogging:
         # May be empty since we mocked _call_claude directly
         assert isinstance(log, list)
 
-    @pytest.mark.asyncio
-    async def test_log_usage_records_entry(self):
+    def test_log_usage_records_entry(self):
         """_log_usage appends a record."""
-        with patch("app.services.llm_router.settings") as mock_settings:
-            mock_settings.ANTHROPIC_API_KEY = ""
-            mock_settings.OPENAI_API_KEY = ""
-            mock_settings.OLLAMA_BASE_URL = "http://localhost:11434"
-            router = LLMRouter()
+        router = LLMRouter(LLMConfig())
 
-        await router._log_usage(
+        router._log_usage(
             provider="claude", model="test-model",
             input_tokens=100, output_tokens=50,
             latency_ms=200.0, task_type="chat",
@@ -167,16 +249,11 @@ class TestUsageLogging:
         assert log[0]["success"] is True
         assert log[0]["input_tokens"] == 100
 
-    @pytest.mark.asyncio
-    async def test_log_usage_records_failure(self):
+    def test_log_usage_records_failure(self):
         """Failed calls are logged with error."""
-        with patch("app.services.llm_router.settings") as mock_settings:
-            mock_settings.ANTHROPIC_API_KEY = ""
-            mock_settings.OPENAI_API_KEY = ""
-            mock_settings.OLLAMA_BASE_URL = "http://localhost:11434"
-            router = LLMRouter()
+        router = LLMRouter(LLMConfig())
 
-        await router._log_usage(
+        router._log_usage(
             provider="openai", model="gpt-4.1",
             input_tokens=0, output_tokens=0,
             latency_ms=0, task_type="chat",
@@ -190,15 +267,278 @@ class TestUsageLogging:
     async def test_fallback_logs_failure(self, router):
         """Provider failures during fallback are logged."""
         router._call_claude.side_effect = Exception("fail")
-        router._call_openai = AsyncMock(return_value=LLMResponse(
-            content="ok", provider="openai", model=DEFAULT_OPENAI_MODEL,
-            input_tokens=10, output_tokens=5, latency_ms=100.0,
-        ))
+        router._call_openai = AsyncMock(return_value=_OPENAI_OK)
         await router.call(prompt="test")
         # Failure should have been logged
-        log = router.get_usage_log()
-        failures = [r for r in log if not r["success"]]
+        failures = router.get_recent_failures()
         assert len(failures) >= 1
+        assert router.get_failure_count() == len(failures)
+
+
+# ---------------------------------------------------------------------------
+# Response Cache Tests
+# ---------------------------------------------------------------------------
+
+
+class TestResponseCache:
+    """Test LLMRouter response caching."""
+
+    @pytest.fixture
+    def router(self):
+        router = LLMRouter(LLMConfig(anthropic_api_key="test-key", openai_api_key="test-key"))
+        router._call_claude = AsyncMock(return_value=_CLAUDE_OK)
+        return router
+
+    @pytest.mark.asyncio
+    async def test_repeated_prompt_served_from_cache(self, router):
+        """An identical second call does not reach the provider."""
+        first = await router.call(prompt="same prompt")
+        second = await router.call(prompt="same prompt")
+        router._call_claude.assert_called_once()
+        assert second.content == first.content
+        assert second.metadata.get("cached") is True
+        assert "cached" not in first.metadata
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_logged_without_tokens(self, router):
+        """Cache hits are logged as cached with zero token usage."""
+        await router.call(prompt="same prompt")
+        await router.call(prompt="same prompt")
+        entry = router.get_usage_log()[-1]
+        assert entry["cached"] is True
+        assert entry["success"] is True
+        assert entry["input_tokens"] == 0
+        assert entry["output_tokens"] == 0
+
+    def test_key_ignores_case_and_whitespace(self):
+        """Prompts differing only in case and spacing share a cache key."""
+        chain = ["claude", "openai", "ollama"]
+        assert LLMCache.make_key(chain, "Hello World", "", "chat", 2048) == \
+            LLMCache.make_key(chain, "  hello   world  ", "", "chat", 2048)
+
+    def test_key_depends_on_chain_order(self):
+        """Local-first and default chains get different 128-bit keys."""
+        default = LLMCache.make_key(["claude", "openai", "ollama"], "hi", "", "chat", 2048)
+        local = LLMCache.make_key(["ollama", "claude", "openai"], "hi", "", "chat", 2048)
+        assert default != local
+        assert len(default) == 32
+
+    @pytest.mark.asyncio
+    async def test_excluded_prompt_bypasses_cache(self, router):
+        """Prompts matching an exclusion pattern always reach the provider."""
+        router._cache = LLMCache(MemoryBackend(), exclude_patterns=TIME_SENSITIVE_PATTERNS)
+        await router.call(prompt="What is scheduled for today?")
+        await router.call(prompt="What is scheduled for today?")
+        assert router._call_claude.call_count == 2
+
+        await router.call(prompt="What is scheduled for line 3?")
+        await router.call(prompt="What is scheduled for line 3?")
+        assert router._call_claude.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_use_cache_false_bypasses_cache(self, router):
+        """use_cache=False always calls the provider."""
+        await router.call(prompt="same prompt")
+        await router.call(prompt="same prompt", use_cache=False)
+        assert router._call_claude.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_different_task_type_is_a_miss(self, router):
+        """The cache key includes task_type."""
+        await router.call(prompt="same prompt", task_type="general")
+        await router.call(prompt="same prompt", task_type="scheduling")
+        assert router._call_claude.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_chat_calls_skip_cache(self, router):
+        """Free-form chat answers are neither stored nor served from the cache."""
+        await router.call(prompt="same prompt", task_type="chat")
+        result = await router.call(prompt="same prompt", task_type="chat")
+        assert router._call_claude.call_count == 2
+        assert "cached" not in result.metadata
+
+    @pytest.mark.asyncio
+    async def test_failed_call_not_cached(self, router):
+        """A call where every provider fails stores nothing."""
+        router._call_claude.side_effect = Exception("Claude down")
+        router._call_openai = AsyncMock(side_effect=Exception("OpenAI down"))
+        router._call_ollama = AsyncMock(side_effect=Exception("Ollama down"))
+        with pytest.raises(RuntimeError):
+            await router.call(prompt="same prompt")
+
+        router._call_claude.side_effect = None
+        result = await router.call(prompt="same prompt")
+        assert "cached" not in result.metadata
+
+    @pytest.mark.asyncio
+    async def test_shared_cache_across_routers(self, router):
+        """Routers given the same LLMCache share hits."""
+        shared = LLMCache(MemoryBackend())
+        router._cache = shared
+        await router.call(prompt="shared prompt")
+
+        other = LLMRouter(LLMConfig(), cache=shared)
+        other._call_ollama = AsyncMock()
+        result = await other.call(prompt="shared prompt")
+        assert result.content == "claude response"
+        other._call_ollama.assert_not_called()
+
+
+class TestProviderClients:
+    """Test provider client reuse and cleanup."""
+
+    @pytest.fixture
+    def router(self):
+        return LLMRouter(LLMConfig())
+
+    def test_config_from_settings(self):
+        """LLMConfig.from_settings copies provider credentials and endpoints."""
+        source = MagicMock(
+            ANTHROPIC_API_KEY="a-key", OPENAI_API_KEY="", OLLAMA_BASE_URL="http://ollama:11434",
+        )
+        config = LLMConfig.from_settings(source)
+        assert config == LLMConfig(anthropic_api_key="a-key", ollama_base_url="http://ollama:11434")
+
+        router = LLMRouter(config)
+        assert router._anthropic is not None
+        assert router._openai is None
+
+    def test_ollama_client_reused(self, router):
+        """The Ollama client is built once and reused across calls."""
+        with patch("app.services.llm_router.openai.AsyncOpenAI") as mock_client_cls:
+            first = router._get_ollama_client()
+            second = router._get_ollama_client()
+        assert first is second
+        mock_client_cls.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_clients(self, router):
+        """aclose() closes every created client."""
+        router._anthropic = AsyncMock()
+        router._ollama = AsyncMock()
+        anthropic_client, ollama_client = router._anthropic, router._ollama
+        await router.aclose()
+        anthropic_client.close.assert_awaited_once()
+        ollama_client.close.assert_awaited_once()
+        assert router._anthropic is None
+        assert router._ollama is None
+
+    @pytest.mark.asyncio
+    async def test_shared_clients_reused_and_left_open(self):
+        """Routers use shared clients as-is and never close them."""
+        clients = LLMClients(
+            anthropic_client=AsyncMock(), openai_client=AsyncMock(), ollama_client=AsyncMock(),
+        )
+        router = LLMRouter(LLMConfig(), clients=clients)
+        assert router._anthropic is clients.anthropic_client
+        assert router._get_ollama_client() is clients.ollama_client
+
+        await router.aclose()
+        clients.anthropic_client.close.assert_not_awaited()
+        clients.ollama_client.close.assert_not_awaited()
+        assert router._anthropic is None
+
+    @pytest.mark.asyncio
+    async def test_shared_clients_closed_once(self):
+        """LLMClients.aclose closes every client and drops the references."""
+        clients = LLMClients(anthropic_client=AsyncMock(), ollama_client=AsyncMock())
+        anthropic_client = clients.anthropic_client
+        await clients.aclose()
+        anthropic_client.close.assert_awaited_once()
+        assert clients.anthropic_client is None
+        assert clients.ollama_client is None
+
+
+class TestMemoryBackend:
+    """Test the in-memory LRU/TTL cache backend."""
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used(self):
+        backend = MemoryBackend(max_entries=2)
+        await backend.set("a", {"v": 1}, ttl_seconds=60)
+        await backend.set("b", {"v": 2}, ttl_seconds=60)
+        await backend.get("a")
+        await backend.set("c", {"v": 3}, ttl_seconds=60)
+        assert await backend.get("b") is None
+        assert await backend.get("a") == {"v": 1}
+        assert len(backend) == 2
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_a_miss(self):
+        backend = MemoryBackend()
+        await backend.set("a", {"v": 1}, ttl_seconds=0)
+        assert await backend.get("a") is None
+
+
+# Fixed embeddings keyed by normalized prompt for semantic cache tests
+_EMBEDDINGS = {
+    "how many orders are late?": [1.0, 0.0, 0.0],
+    "how many orders are overdue?": [0.99, 0.14, 0.0],
+    "list all production lines": [0.0, 1.0, 0.0],
+    "third prompt": [0.0, 0.0, 1.0],
+}
+
+
+async def _fake_embed(text: str) -> list[float]:
+    return _EMBEDDINGS[text]
+
+
+class TestSemanticCache:
+    """Test the embedding-similarity cache tier."""
+
+    @pytest.fixture
+    def router(self):
+        router = LLMRouter(
+            LLMConfig(anthropic_api_key="test-key"),
+            semantic_cache=SemanticCache(_fake_embed, threshold=0.95),
+        )
+        router._call_claude = AsyncMock(return_value=LLMResponse(
+            content="3 orders", provider="claude", model=DEFAULT_CLAUDE_MODEL,
+            input_tokens=10, output_tokens=5, latency_ms=100.0,
+        ))
+        return router
+
+    @pytest.mark.asyncio
+    async def test_similar_prompt_served_from_semantic_cache(self, router):
+        await router.call(prompt="How many orders are late?")
+        result = await router.call(prompt="How many orders are overdue?")
+        router._call_claude.assert_called_once()
+        assert result.content == "3 orders"
+        assert result.metadata["cached"] is True
+        assert result.metadata["similarity"] >= 0.95
+
+    @pytest.mark.asyncio
+    async def test_dissimilar_prompt_misses(self, router):
+        await router.call(prompt="How many orders are late?")
+        await router.call(prompt="List all production lines")
+        assert router._call_claude.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_scope_must_match(self, router):
+        """A similar prompt for a different task type is not reused."""
+        await router.call(prompt="How many orders are late?", task_type="general")
+        await router.call(prompt="How many orders are overdue?", task_type="scheduling")
+        assert router._call_claude.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_prefer_local_never_embeds(self, router):
+        """Prompts routed locally for privacy are never sent to the embedding service."""
+        router._call_ollama = AsyncMock(return_value=_OLLAMA_OK)
+        router._semantic_cache.embed = AsyncMock()
+        await router.call(prompt="How many orders are late?", prefer_local=True)
+        await router.call(prompt="How many orders are overdue?", prefer_local=True)
+        router._semantic_cache.embed.assert_not_called()
+        assert router._call_ollama.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_oldest_entry_overwritten_when_full(self):
+        cache = SemanticCache(_fake_embed, max_entries=2)
+        for prompt in ("how many orders are late?", "list all production lines", "third prompt"):
+            cache.add("scope", await cache.embed(prompt), {"prompt": prompt})
+        assert len(cache) == 2
+        assert cache.lookup("scope", await cache.embed("how many orders are late?")) is None
+        value, _ = cache.lookup("scope", await cache.embed("third prompt"))
+        assert value == {"prompt": "third prompt"}
 
 
 # ---------------------------------------------------------------------------
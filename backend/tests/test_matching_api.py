@@ -1,9 +1,12 @@
 """Tests for Line Capabilities CRUD and Product-to-Line matching API."""
 
 import uuid
-from unittest.mock import AsyncMock, MagicMock
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
 
 import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
 
 from app.api.v1.matching import (
     create_line_capability,
@@ -13,12 +16,16 @@ from app.api.v1.matching import (
     match_product_to_lines,
 )
 from app.schemas.line_capability import LineCapabilityCreate
+from tests.fakes import FakeResult
+
+# Placeholder ID for arguments whose value the test never inspects
+_ANY_ID = uuid.uuid4()
 
 
 @pytest.fixture
 def cap_payload():
     return LineCapabilityCreate(
-        production_line_id=uuid.uuid4(),
+        production_line_id=_ANY_ID,
         equipment_type="SMT",
     )
 
@@ -31,10 +38,8 @@ def mock_cap(capability_factory):
 class TestListLineCapabilities:
     @pytest.mark.asyncio
     async def test_list_returns_capabilities(self, mock_db, capability_factory):
-        caps = [capability_factory.create(), capability_factory.create()]
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = caps
-        mock_db.execute = AsyncMock(return_value=mock_result)
+        caps = capability_factory.create_batch(2)
+        mock_db.execute = AsyncMock(return_value=FakeResult(caps))
 
         result = await list_line_capabilities(
             production_line_id=None, skip=0, limit=50, db=mock_db
@@ -54,99 +59,81 @@ class TestCreateLineCapability:
 class TestGetLineCapability:
     @pytest.mark.asyncio
     async def test_get_found(self, mock_db, mock_cap):
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = mock_cap
-        mock_db.execute = AsyncMock(return_value=mock_result)
+        mock_db.execute = AsyncMock(return_value=FakeResult([mock_cap]))
 
         result = await get_line_capability(capability_id=mock_cap.id, db=mock_db)
         assert result == mock_cap
 
     @pytest.mark.asyncio
     async def test_get_not_found(self, mock_db):
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_db.execute = AsyncMock(return_value=mock_result)
+        mock_db.execute = AsyncMock(return_value=FakeResult())
 
-        with pytest.raises(Exception) as exc_info:
-            await get_line_capability(capability_id=uuid.uuid4(), db=mock_db)
+        with pytest.raises(HTTPException) as exc_info:
+            await get_line_capability(capability_id=_ANY_ID, db=mock_db)
         assert exc_info.value.status_code == 404
 
 
 class TestDeleteLineCapability:
     @pytest.mark.asyncio
     async def test_delete_success(self, mock_db, mock_cap):
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = mock_cap
-        mock_db.execute = AsyncMock(return_value=mock_result)
+        mock_db.execute = AsyncMock(return_value=FakeResult([mock_cap]))
 
         await delete_line_capability(capability_id=mock_cap.id, db=mock_db)
         mock_db.delete.assert_awaited_once_with(mock_cap)
 
     @pytest.mark.asyncio
     async def test_delete_not_found(self, mock_db):
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_db.execute = AsyncMock(return_value=mock_result)
+        mock_db.execute = AsyncMock(return_value=FakeResult())
 
-        with pytest.raises(Exception) as exc_info:
-            await delete_line_capability(capability_id=uuid.uuid4(), db=mock_db)
+        with pytest.raises(HTTPException) as exc_info:
+            await delete_line_capability(capability_id=_ANY_ID, db=mock_db)
         assert exc_info.value.status_code == 404
 
 
 class TestMatchProductToLines:
     @pytest.mark.asyncio
-    async def test_match_returns_lines_with_all_types(self, mock_db, line_factory):
-        line1 = line_factory.create(name="Line-A")
-        line2 = line_factory.create(name="Line-B")
-
-        # First call: fetch active lines
-        lines_result = MagicMock()
-        lines_result.scalars.return_value.all.return_value = [line1, line2]
-
-        # Capability queries: line1 has SMT+reflow, line2 has only SMT
-        caps_line1 = MagicMock()
-        caps_line1.all.return_value = [("SMT",), ("reflow",)]
-
-        caps_line2 = MagicMock()
-        caps_line2.all.return_value = [("SMT",)]
-
-        mock_db.execute = AsyncMock(side_effect=[lines_result, caps_line1, caps_line2])
+    async def test_match_returns_lines_with_all_types(self, mock_db):
+        line_id = uuid.uuid4()
+        # The grouped query only returns lines covering every required type
+        mock_db.execute = AsyncMock(return_value=FakeResult([
+            SimpleNamespace(id=line_id, name="Line-A", all_types=["reflow", "SMT", "AOI"]),
+        ]))
 
         result = await match_product_to_lines(
-            product_id=uuid.uuid4(),
+            product_id=_ANY_ID,
             equipment_types=["SMT", "reflow"],
             db=mock_db,
         )
         assert len(result) == 1
         assert result[0]["name"] == "Line-A"
+        assert result[0]["production_line_id"] == str(line_id)
+        assert result[0]["matched_types"] == ["SMT", "reflow"]
+        assert result[0]["all_types"] == ["AOI", "SMT", "reflow"]
 
     @pytest.mark.asyncio
-    async def test_match_no_lines_match(self, mock_db, line_factory):
-        line = line_factory.create()
-        lines_result = MagicMock()
-        lines_result.scalars.return_value.all.return_value = [line]
-
-        caps = MagicMock()
-        caps.all.return_value = [("assembly",)]
+    async def test_match_uses_single_grouped_query(self, mock_db):
+        mock_db.execute = AsyncMock(return_value=FakeResult())
 
-        mock_db.execute = AsyncMock(side_effect=[lines_result, caps])
-
-        result = await match_product_to_lines(
-            product_id=uuid.uuid4(),
-            equipment_types=["SMT", "reflow"],
+        await match_product_to_lines(
+            product_id=_ANY_ID,
+            equipment_types=["SMT", "reflow", "SMT"],
             db=mock_db,
         )
-        assert len(result) == 0
+        mock_db.execute.assert_awaited_once()
+        stmt = mock_db.execute.call_args.args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "GROUP BY" in sql
+        assert "HAVING" in sql
+        # Duplicate requested types count once
+        assert stmt.compile(dialect=postgresql.dialect()).params["required_count"] == 2
 
     @pytest.mark.asyncio
-    async def test_match_empty_active_lines(self, mock_db):
-        lines_result = MagicMock()
-        lines_result.scalars.return_value.all.return_value = []
-        mock_db.execute = AsyncMock(return_value=lines_result)
+    async def test_match_no_lines_match(self, mock_db):
+        mock_db.execute = AsyncMock(return_value=FakeResult())
 
         result = await match_product_to_lines(
-            product_id=uuid.uuid4(),
-            equipment_types=["SMT"],
+            product_id=_ANY_ID,
+            equipment_types=["SMT", "reflow"],
             db=mock_db,
         )
         assert len(result) == 0
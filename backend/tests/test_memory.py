@@ -1,12 +1,40 @@
 """Tests for MemoryService: decision records CRUD, importance scoring, lifecycle management."""
 
+import asyncio
 import uuid
 from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import numpy as np
 import pytest
+from qdrant_client.models import PointStruct
+from sqlalchemy.dialects import postgresql
 
 from app.services.memory_service import MemoryService, HOT_THRESHOLD_DAYS, WARM_THRESHOLD_DAYS
+from app.services.qdrant_batcher import AsyncBatchUpserter
+
+# Shared, read-only stand-in for an embedding vector
+_FAKE_EMBEDDING = np.full(1536, 0.1, dtype=np.float32)
+_FAKE_EMBEDDING.setflags(write=False)
+
+# Content lengths just past the medium (200) and long (500) boosts
+_S201 = "x" * 201
+_S501 = "x" * 501
+_KEYWORD_BLOB = "urgent rush failure exception delay 緊急 趕工 故障 異常 延遲 " + _S501 + "x" * 99
+
+
+async def _fake_embed(_text: str) -> np.ndarray:
+    """Plain coroutine stand-in for EmbeddingService.embed_text."""
+    return _FAKE_EMBEDDING
+
+
+def _make_mock_services() -> tuple[AsyncMock, AsyncMock]:
+    """Build a mocked Qdrant client and embedding service."""
+    mock_qdrant = AsyncMock()
+    mock_qdrant.upsert = AsyncMock()
+    mock_embedding = AsyncMock()
+    mock_embedding.embed_text = _fake_embed
+    return mock_qdrant, mock_embedding
 
 
 # ---------------------------------------------------------------------------
@@ -17,64 +45,32 @@ from app.services.memory_service import MemoryService, HOT_THRESHOLD_DAYS, WARM_
 class TestImportanceScoring:
     """Test MemoryService._score_importance static method."""
 
-    def test_base_score_for_short_content(self):
-        """Short generic content gets base score."""
-        score = MemoryService._score_importance("hello", "chat")
-        assert score == 0.5
-
-    def test_long_content_boost(self):
-        """Content over 500 chars gets +0.1 boost."""
-        long_text = "x" * 501
-        score = MemoryService._score_importance(long_text, "chat")
-        assert score == pytest.approx(0.6, abs=0.01)
-
-    def test_medium_content_boost(self):
-        """Content 200-500 chars gets +0.05 boost."""
-        medium_text = "x" * 201
-        score = MemoryService._score_importance(medium_text, "chat")
-        assert score == pytest.approx(0.55, abs=0.01)
-
-    def test_scheduling_category_weight(self):
-        """Scheduling category adds 0.15."""
-        score = MemoryService._score_importance("test", "scheduling")
-        assert score == pytest.approx(0.65, abs=0.01)
-
-    def test_rush_order_category_weight(self):
-        """Rush order category adds 0.2."""
-        score = MemoryService._score_importance("test", "rush_order")
-        assert score == pytest.approx(0.7, abs=0.01)
-
-    def test_exception_category_weight(self):
-        """Exception category adds 0.2."""
-        score = MemoryService._score_importance("test", "exception")
-        assert score == pytest.approx(0.7, abs=0.01)
-
-    def test_keyword_boost_urgent(self):
-        """Keyword 'urgent' adds 0.05."""
-        score = MemoryService._score_importance("this is urgent", "chat")
-        assert score == pytest.approx(0.55, abs=0.01)
-
-    def test_keyword_boost_chinese(self):
-        """Chinese keyword '緊急' adds 0.05."""
-        score = MemoryService._score_importance("這是緊急訂單", "chat")
-        assert score == pytest.approx(0.55, abs=0.01)
-
-    def test_multiple_keywords_stack(self):
-        """Multiple keywords each add 0.05."""
-        score = MemoryService._score_importance("urgent rush failure", "chat")
-        assert score == pytest.approx(0.65, abs=0.01)
+    @pytest.mark.parametrize(
+        ("content", "category", "expected"),
+        [
+            pytest.param("hello", "chat", 0.5, id="base-score-short-content"),
+            pytest.param(_S501, "chat", 0.6, id="long-content-boost"),
+            pytest.param(_S201, "chat", 0.55, id="medium-content-boost"),
+            pytest.param("test", "scheduling", 0.65, id="scheduling-category"),
+            pytest.param("test", "rush_order", 0.7, id="rush-order-category"),
+            pytest.param("test", "exception", 0.7, id="exception-category"),
+            pytest.param("test", "unknown_category", 0.5, id="unknown-category"),
+            pytest.param("this is urgent", "chat", 0.55, id="keyword-urgent"),
+            pytest.param("這是緊急訂單", "chat", 0.55, id="keyword-chinese"),
+            pytest.param("urgent rush failure", "chat", 0.65, id="keywords-stack"),
+            pytest.param("Urgent! urgent urgent", "chat", 0.55, id="repeated-keyword-once"),
+        ],
+    )
+    def test_score(self, content, category, expected):
+        """Length, category weight, and distinct keywords each add to the 0.5 base."""
+        score = MemoryService._score_importance(content, category)
+        assert score == pytest.approx(expected, abs=0.01)
 
     def test_score_capped_at_one(self):
         """Score never exceeds 1.0."""
-        text = "urgent rush failure exception delay 緊急 趕工 故障 異常 延遲 " + "x" * 600
-        score = MemoryService._score_importance(text, "rush_order")
+        score = MemoryService._score_importance(_KEYWORD_BLOB, "rush_order")
         assert score <= 1.0
 
-    def test_unknown_category_no_weight(self):
-        """Unknown category adds 0.0."""
-        score = MemoryService._score_importance("test", "unknown_category")
-        assert score == pytest.approx(0.5, abs=0.01)
-
 
 # ---------------------------------------------------------------------------
 # Decision CRUD Tests (mocked DB + Qdrant)
@@ -87,12 +83,8 @@ class TestDecisionCRUD:
     @pytest.fixture
     def memory_service(self, mock_db):
         """MemoryService with mocked DB and Qdrant."""
-        mock_qdrant = AsyncMock()
-        mock_embedding = AsyncMock()
-        mock_embedding.embed_text = AsyncMock(return_value=[0.1] * 1536)
-        mock_qdrant.upsert = AsyncMock()
-        svc = MemoryService(db=mock_db, qdrant=mock_qdrant, embedding_service=mock_embedding)
-        return svc
+        mock_qdrant, mock_embedding = _make_mock_services()
+        return MemoryService(db=mock_db, qdrant=mock_qdrant, embedding_service=mock_embedding)
 
     @pytest.mark.asyncio
     async def test_create_decision_adds_to_db(self, memory_service, mock_db):
@@ -165,10 +157,7 @@ class TestMemoryCRUD:
 
     @pytest.fixture
     def memory_service(self, mock_db):
-        mock_qdrant = AsyncMock()
-        mock_embedding = AsyncMock()
-        mock_embedding.embed_text = AsyncMock(return_value=[0.1] * 1536)
-        mock_qdrant.upsert = AsyncMock()
+        mock_qdrant, mock_embedding = _make_mock_services()
         return MemoryService(db=mock_db, qdrant=mock_qdrant, embedding_service=mock_embedding)
 
     @pytest.mark.asyncio
@@ -191,6 +180,17 @@ class TestMemoryCRUD:
         )
         memory_service.qdrant.upsert.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_search_sends_plain_list_vector(self, memory_service):
+        """The float32 embedding is converted to a list at the Qdrant boundary."""
+        memory_service.qdrant.query_points.return_value = MagicMock(points=[])
+
+        await memory_service.search_memories("rush order")
+
+        query = memory_service.qdrant.query_points.call_args.kwargs["query"]
+        assert isinstance(query, list)
+        assert len(query) == 1536
+
     @pytest.mark.asyncio
     async def test_get_memory_updates_access_tracking(self, memory_service, mock_db):
         """get_memory increments access_count and updates last_accessed_at."""
@@ -221,27 +221,37 @@ class TestLifecycleManagement:
 
     @pytest.mark.asyncio
     async def test_lifecycle_returns_counts(self, memory_service, mock_db):
-        """run_lifecycle_transitions returns transition counts."""
-        # Mock the two update queries
-        mock_hot_result = MagicMock()
-        mock_hot_result.scalar.return_value = 3
-        mock_cold_result = MagicMock()
-        mock_cold_result.scalar.return_value = 1
-        mock_db.execute.side_effect = [mock_hot_result, mock_cold_result]
+        """run_lifecycle_transitions returns transition counts from a single query."""
+        mock_result = MagicMock()
+        mock_result.one.return_value = (3, 1)
+        mock_db.execute.return_value = mock_result
 
         result = await memory_service.run_lifecycle_transitions()
         assert result == {"hot_to_warm": 3, "warm_to_cold": 1}
+        assert mock_db.execute.call_count == 1
 
     @pytest.mark.asyncio
     async def test_lifecycle_zero_transitions(self, memory_service, mock_db):
         """run_lifecycle_transitions returns zeros when nothing transitions."""
         mock_result = MagicMock()
-        mock_result.scalar.return_value = 0
+        mock_result.one.return_value = (0, 0)
         mock_db.execute.return_value = mock_result
 
         result = await memory_service.run_lifecycle_transitions()
         assert result == {"hot_to_warm": 0, "warm_to_cold": 0}
 
+    @pytest.mark.asyncio
+    async def test_lifecycle_updates_run_as_ctes(self, memory_service, mock_db):
+        """Both UPDATEs are compiled into one statement as data-modifying CTEs."""
+        mock_db.execute.return_value = MagicMock(one=MagicMock(return_value=(0, 0)))
+
+        await memory_service.run_lifecycle_transitions()
+
+        stmt = mock_db.execute.call_args.args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert sql.count("UPDATE memory_entries") == 2
+        assert "WITH hot_to_warm AS" in sql
+
     def test_hot_threshold_is_7_days(self):
         """Hot threshold is 7 days."""
         assert HOT_THRESHOLD_DAYS == 7
@@ -249,3 +259,81 @@ class TestLifecycleManagement:
     def test_warm_threshold_is_90_days(self):
         """Warm threshold is 90 days."""
         assert WARM_THRESHOLD_DAYS == 90
+
+
+# ---------------------------------------------------------------------------
+# Batched Qdrant Upserts
+# ---------------------------------------------------------------------------
+
+
+def _point(i: int) -> PointStruct:
+    return PointStruct(id=i, vector=[0.1, 0.2], payload={})
+
+
+class TestAsyncBatchUpserter:
+    """Test the write-coalescing Qdrant upserter."""
+
+    @pytest.mark.asyncio
+    async def test_memory_service_queues_instead_of_upserting(self, mock_db):
+        """With an upserter, create_memory queues the point and skips the direct upsert."""
+        mock_qdrant, mock_embedding = _make_mock_services()
+        upserter = MagicMock(spec=AsyncBatchUpserter)
+        svc = MemoryService(
+            db=mock_db, qdrant=mock_qdrant, embedding_service=mock_embedding, upserter=upserter,
+        )
+
+        await svc.create_memory(memory_type="episodic", category="test", content="Queued")
+
+        upserter.add.assert_called_once()
+        mock_qdrant.upsert.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_flush_splits_into_batches(self):
+        mock_qdrant = AsyncMock()
+        upserter = AsyncBatchUpserter(mock_qdrant, "memories", batch_size=2)
+        for i in range(5):
+            upserter.add(_point(i))
+
+        await upserter.flush()
+
+        sizes = [len(c.kwargs["points"]) for c in mock_qdrant.upsert.call_args_list]
+        assert sizes == [2, 2, 1]
+
+    @pytest.mark.asyncio
+    async def test_background_loop_coalesces_points(self):
+        mock_qdrant = AsyncMock()
+        upserter = AsyncBatchUpserter(mock_qdrant, "memories", interval_seconds=0.01)
+        upserter.start()
+        for i in range(3):
+            upserter.add(_point(i))
+        await asyncio.sleep(0.05)
+        await upserter.stop()
+
+        mock_qdrant.upsert.assert_awaited_once()
+        assert len(mock_qdrant.upsert.call_args.kwargs["points"]) == 3
+
+    @pytest.mark.asyncio
+    async def test_stop_waits_for_in_flight_upsert(self):
+        """An upsert running when stop() is called completes before stop() returns."""
+        started, finished = asyncio.Event(), asyncio.Event()
+
+        async def slow_upsert(**kwargs):
+            started.set()
+            await asyncio.sleep(0.05)
+            finished.set()
+
+        mock_qdrant = AsyncMock()
+        mock_qdrant.upsert.side_effect = slow_upsert
+        upserter = AsyncBatchUpserter(mock_qdrant, "memories", interval_seconds=0)
+        upserter.start()
+        upserter.add(_point(1))
+        await asyncio.wait_for(started.wait(), timeout=1)
+        await upserter.stop()
+        assert finished.is_set()
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_and_counts(self):
+        upserter = AsyncBatchUpserter(AsyncMock(), "memories", max_queue=1)
+        assert upserter.add(_point(1)) is True
+        assert upserter.add(_point(2)) is False
+        assert upserter.dropped == 1
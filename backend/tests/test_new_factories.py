@@ -17,8 +17,7 @@ class TestProcessStationFactory:
         assert s.standard_cycle_time == 120.0
 
     def test_counter_increments(self, station_factory):
-        s1 = station_factory.create()
-        s2 = station_factory.create()
+        s1, s2 = station_factory.create_batch(2)
         assert s1.station_order == 1
         assert s2.station_order == 2
         assert s1.id != s2.id
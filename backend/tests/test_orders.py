@@ -7,6 +7,13 @@ import pytest
 
 from app.schemas.order import OrderCreate, OrderItemCreate
 
+# Fixed reference time; none of these tests depend on the wall clock
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+# One character past the order_no (50) and customer_name (200) limits
+_ORDER_NO_TOO_LONG = "X" * 51
+_CUSTOMER_NAME_TOO_LONG = "X" * 201
+
 
 # ---------------------------------------------------------------------------
 # Schema Validation Tests
@@ -16,12 +23,15 @@ from app.schemas.order import OrderCreate, OrderItemCreate
 class TestOrderSchemaValidation:
     """Test OrderCreate schema validation rules."""
 
+    # Validated once; default-value tests inspect it instead of re-validating
+    _BASE = OrderCreate(order_no="ORD-BASE", customer_name="Customer", due_date=NOW)
+
     def test_valid_order_create(self):
         """OrderCreate accepts valid data."""
         order = OrderCreate(
             order_no="ORD-001",
             customer_name="Test Customer",
-            due_date=datetime.now(timezone.utc) + timedelta(days=7),
+            due_date=NOW + timedelta(days=7),
             priority=5,
             items=[],
         )
@@ -30,12 +40,7 @@ class TestOrderSchemaValidation:
 
     def test_order_default_priority(self):
         """OrderCreate defaults priority to 5."""
-        order = OrderCreate(
-            order_no="ORD-002",
-            customer_name="Customer",
-            due_date=datetime.now(timezone.utc),
-        )
-        assert order.priority == 5
+        assert self._BASE.priority == 5
 
     def test_order_priority_lower_bound(self):
         """OrderCreate rejects priority < 1."""
@@ -43,7 +48,7 @@ class TestOrderSchemaValidation:
             OrderCreate(
                 order_no="ORD-003",
                 customer_name="Customer",
-                due_date=datetime.now(timezone.utc),
+                due_date=NOW,
                 priority=0,
             )
 
@@ -53,7 +58,7 @@ class TestOrderSchemaValidation:
             OrderCreate(
                 order_no="ORD-004",
                 customer_name="Customer",
-                due_date=datetime.now(timezone.utc),
+                due_date=NOW,
                 priority=11,
             )
 
@@ -63,7 +68,7 @@ class TestOrderSchemaValidation:
         order = OrderCreate(
             order_no="ORD-005",
             customer_name="Customer",
-            due_date=datetime.now(timezone.utc),
+            due_date=NOW,
             items=[OrderItemCreate(product_id=product_id, quantity=50)],
         )
         assert len(order.items) == 1
@@ -78,9 +83,9 @@ class TestOrderSchemaValidation:
         """OrderCreate rejects order_no exceeding 50 chars."""
         with pytest.raises(Exception):
             OrderCreate(
-                order_no="X" * 51,
+                order_no=_ORDER_NO_TOO_LONG,
                 customer_name="Customer",
-                due_date=datetime.now(timezone.utc),
+                due_date=NOW,
             )
 
     def test_order_customer_name_max_length(self):
@@ -88,27 +93,19 @@ class TestOrderSchemaValidation:
         with pytest.raises(Exception):
             OrderCreate(
                 order_no="ORD-006",
-                customer_name="X" * 201,
-                due_date=datetime.now(timezone.utc),
+                customer_name=_CUSTOMER_NAME_TOO_LONG,
+                due_date=NOW,
             )
 
     def test_order_notes_optional(self):
         """OrderCreate allows notes to be None."""
-        order = OrderCreate(
-            order_no="ORD-007",
-            customer_name="Customer",
-            due_date=datetime.now(timezone.utc),
-        )
-        assert order.notes is None
+        assert self._BASE.notes is None
+        order = self._BASE.model_copy(update={"notes": "rush"})
+        assert order.notes == "rush"
 
     def test_order_items_default_empty(self):
         """OrderCreate defaults items to empty list."""
-        order = OrderCreate(
-            order_no="ORD-008",
-            customer_name="Customer",
-            due_date=datetime.now(timezone.utc),
-        )
-        assert order.items == []
+        assert self._BASE.items == []
 
 
 # ---------------------------------------------------------------------------
@@ -159,7 +156,7 @@ class TestOrderFiltering:
 
     def test_orders_have_unique_order_numbers(self, order_factory):
         """Each factory-created order has a unique order_no."""
-        orders = [order_factory.create() for _ in range(5)]
+        orders = order_factory.create_batch(5)
         order_nos = [o.order_no for o in orders]
         assert len(set(order_nos)) == 5
 
@@ -175,14 +172,13 @@ class TestOrderFiltering:
 
     def test_filter_by_due_date_range(self, order_factory):
         """Orders can be filtered by due date range."""
-        now = datetime.now(timezone.utc)
         orders = [
-            order_factory.create(due_date=now - timedelta(days=1)),
-            order_factory.create(due_date=now + timedelta(days=3)),
-            order_factory.create(due_date=now + timedelta(days=10)),
+            order_factory.create(due_date=NOW - timedelta(days=1)),
+            order_factory.create(due_date=NOW + timedelta(days=3)),
+            order_factory.create(due_date=NOW + timedelta(days=10)),
         ]
-        start = now
-        end = now + timedelta(days=7)
+        start = NOW
+        end = NOW + timedelta(days=7)
         in_range = [o for o in orders if start <= o.due_date <= end]
         assert len(in_range) == 1
 
@@ -1,48 +1,50 @@
 """Tests for ProcessRoute Pydantic schemas."""
 
+import json
 import uuid
 from datetime import datetime, timezone
 
 import pytest
+from pydantic import ValidationError
 
 from app.schemas.process_route import ProcessRouteCreate, ProcessRouteResponse
 
 
+# Fixed reference time; none of these tests depend on the wall clock
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
 VALID_STEPS = [
     {"station_order": 1, "equipment_type": "SMT", "cycle_time_sec": 45.0},
     {"station_order": 2, "equipment_type": "reflow", "cycle_time_sec": 120.0},
 ]
 
+# Minimal valid request body; negative cases override a single field
+_VALID_ROUTE = {"product_id": str(uuid.uuid4()), "steps": VALID_STEPS}
+# Serialized once, as the API receives it
+_VALID_ROUTE_JSON = json.dumps(_VALID_ROUTE)
+
 
 class TestProcessRouteCreate:
     def test_valid_defaults(self):
-        r = ProcessRouteCreate(
-            product_id=uuid.uuid4(),
-            steps=VALID_STEPS,
-        )
+        r = ProcessRouteCreate.model_validate_json(_VALID_ROUTE_JSON)
         assert r.version == 1
         assert r.is_active is True
         assert r.source == "manual"
 
-    def test_invalid_source(self):
-        with pytest.raises(Exception):
-            ProcessRouteCreate(
-                product_id=uuid.uuid4(),
-                steps=VALID_STEPS,
-                source="unknown_source",
-            )
-
-    def test_steps_must_not_be_empty(self):
-        with pytest.raises(Exception):
-            ProcessRouteCreate(
-                product_id=uuid.uuid4(),
-                steps=[],
-            )
+    @pytest.mark.parametrize(
+        "override",
+        [
+            pytest.param({"source": "unknown_source"}, id="invalid-source"),
+            pytest.param({"steps": []}, id="empty-steps"),
+        ],
+    )
+    def test_rejects_invalid(self, override):
+        with pytest.raises(ValidationError):
+            ProcessRouteCreate(**{**_VALID_ROUTE, **override})
 
 
 class TestProcessRouteResponse:
     def test_from_attributes(self):
-        now = datetime.now(timezone.utc)
         r = ProcessRouteResponse(
             id=uuid.uuid4(),
             product_id=uuid.uuid4(),
@@ -51,7 +53,21 @@ class TestProcessRouteResponse:
             steps=VALID_STEPS,
             source="manual",
             source_file=None,
-            created_at=now,
-            updated_at=now,
+            created_at=NOW,
+            updated_at=NOW,
         )
         assert r.source == "manual"
+
+    def test_json_round_trip_preserves_datetimes(self):
+        r = ProcessRouteResponse(
+            id=uuid.uuid4(),
+            product_id=uuid.uuid4(),
+            version=1,
+            is_active=True,
+            steps=VALID_STEPS,
+            source="manual",
+            source_file=None,
+            created_at=NOW,
+            updated_at=NOW,
+        )
+        assert ProcessRouteResponse.model_validate_json(r.model_dump_json()) == r
@@ -1,9 +1,11 @@
 """Tests for Process Routes CRUD API endpoints."""
 
 import uuid
-from unittest.mock import AsyncMock, MagicMock
+from types import MappingProxyType
+from unittest.mock import AsyncMock
 
 import pytest
+from fastapi import HTTPException
 
 from app.api.v1.process_routes import (
     create_process_route,
@@ -12,16 +14,24 @@ from app.api.v1.process_routes import (
     list_process_routes,
     update_process_route,
 )
-from app.schemas.process_route import ProcessRouteCreate
+from app.schemas.process_route import ProcessRouteCreate, ProcessRouteResponse
+from tests.fakes import FakeResult
 
-VALID_STEPS = [
-    {"station_order": 1, "equipment_type": "SMT", "cycle_time_sec": 45.0},
-    {"station_order": 2, "equipment_type": "reflow", "cycle_time_sec": 120.0},
-]
+# Read-only so the module-scoped payload cannot be altered through shared step data
+VALID_STEPS = (
+    MappingProxyType({"station_order": 1, "equipment_type": "SMT", "cycle_time_sec": 45.0}),
+    MappingProxyType({"station_order": 2, "equipment_type": "reflow", "cycle_time_sec": 120.0}),
+)
 
 
-@pytest.fixture
+def _result(*rows) -> AsyncMock:
+    """Mocked ``session.execute`` returning the given rows."""
+    return AsyncMock(return_value=FakeResult(list(rows)))
+
+
+@pytest.fixture(scope="module")
 def route_payload():
+    """Validated once per module; the endpoints only read from the payload."""
     return ProcessRouteCreate(
         product_id=uuid.uuid4(),
         steps=VALID_STEPS,
@@ -36,22 +46,31 @@ def mock_route(route_factory):
 class TestListProcessRoutes:
     @pytest.mark.asyncio
     async def test_list_returns_routes(self, mock_db, route_factory):
-        routes = [route_factory.create(), route_factory.create()]
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = routes
-        mock_db.execute = AsyncMock(return_value=mock_result)
+        routes = route_factory.create_batch(2)
+        mock_db.execute = _result(*routes)
 
         result = await list_process_routes(
             product_id=None, active_only=False, skip=0, limit=50, db=mock_db
         )
         assert len(result) == 2
+        assert [r.id for r in result] == [r.id for r in routes]
+
+    @pytest.mark.asyncio
+    async def test_list_builds_responses_for_full_page(self, mock_db, route_factory):
+        routes = route_factory.create_batch(100)
+        mock_db.execute = _result(*routes)
+
+        result = await list_process_routes(
+            product_id=None, active_only=False, skip=0, limit=100, db=mock_db
+        )
+        assert len(result) == 100
+        assert all(isinstance(r, ProcessRouteResponse) for r in result)
+        assert result[0].steps == routes[0].steps
 
     @pytest.mark.asyncio
     async def test_list_filters_by_product_id(self, mock_db, route_factory):
         pid = uuid.uuid4()
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = [route_factory.create(product_id=pid)]
-        mock_db.execute = AsyncMock(return_value=mock_result)
+        mock_db.execute = _result(route_factory.create(product_id=pid))
 
         result = await list_process_routes(
             product_id=pid, active_only=False, skip=0, limit=50, db=mock_db
@@ -62,7 +81,7 @@ class TestListProcessRoutes:
 class TestCreateProcessRoute:
     @pytest.mark.asyncio
     async def test_create_deactivates_existing(self, mock_db, route_payload):
-        mock_db.execute = AsyncMock(return_value=MagicMock())
+        mock_db.execute = _result()
         mock_db.refresh = AsyncMock()
 
         await create_process_route(payload=route_payload, db=mock_db)
@@ -76,20 +95,16 @@ class TestCreateProcessRoute:
 class TestGetProcessRoute:
     @pytest.mark.asyncio
     async def test_get_found(self, mock_db, mock_route):
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = mock_route
-        mock_db.execute = AsyncMock(return_value=mock_result)
+        mock_db.execute = _result(mock_route)
 
         result = await get_process_route(route_id=mock_route.id, db=mock_db)
         assert result == mock_route
 
     @pytest.mark.asyncio
     async def test_get_not_found(self, mock_db):
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_db.execute = AsyncMock(return_value=mock_result)
+        mock_db.execute = _result()
 
-        with pytest.raises(Exception) as exc_info:
+        with pytest.raises(HTTPException) as exc_info:
             await get_process_route(route_id=uuid.uuid4(), db=mock_db)
         assert exc_info.value.status_code == 404
 
@@ -97,9 +112,7 @@ class TestGetProcessRoute:
 class TestUpdateProcessRoute:
     @pytest.mark.asyncio
     async def test_update_success(self, mock_db, mock_route, route_payload):
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = mock_route
-        mock_db.execute = AsyncMock(return_value=mock_result)
+        mock_db.execute = _result(mock_route)
         mock_db.refresh = AsyncMock()
 
         result = await update_process_route(
@@ -109,11 +122,9 @@ class TestUpdateProcessRoute:
 
     @pytest.mark.asyncio
     async def test_update_not_found(self, mock_db, route_payload):
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_db.execute = AsyncMock(return_value=mock_result)
+        mock_db.execute = _result()
 
-        with pytest.raises(Exception) as exc_info:
+        with pytest.raises(HTTPException) as exc_info:
             await update_process_route(
                 route_id=uuid.uuid4(), payload=route_payload, db=mock_db
             )
@@ -123,19 +134,15 @@ class TestUpdateProcessRoute:
 class TestDeleteProcessRoute:
     @pytest.mark.asyncio
     async def test_delete_success(self, mock_db, mock_route):
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = mock_route
-        mock_db.execute = AsyncMock(return_value=mock_result)
+        mock_db.execute = _result(mock_route)
 
         await delete_process_route(route_id=mock_route.id, db=mock_db)
         mock_db.delete.assert_awaited_once_with(mock_route)
 
     @pytest.mark.asyncio
     async def test_delete_not_found(self, mock_db):
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_db.execute = AsyncMock(return_value=mock_result)
+        mock_db.execute = _result()
 
-        with pytest.raises(Exception) as exc_info:
+        with pytest.raises(HTTPException) as exc_info:
             await delete_process_route(route_id=uuid.uuid4(), db=mock_db)
         assert exc_info.value.status_code == 404
@@ -1,49 +1,49 @@
 """Tests for ProcessStation Pydantic schemas."""
 
+import json
 import uuid
 from datetime import datetime, timezone
 
 import pytest
+from pydantic import ValidationError
 
 from app.schemas.process_station import ProcessStationCreate, ProcessStationResponse
 
+# Fixed reference time; none of these tests depend on the wall clock
+NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+# Minimal valid request body; negative cases override a single field
+_MINIMAL_STATION = {
+    "production_line_id": str(uuid.uuid4()),
+    "name": "SMT Station 1",
+    "station_order": 1,
+    "equipment_type": "SMT",
+    "standard_cycle_time": 45.0,
+}
+# Serialized once, as the API receives it
+_MINIMAL_STATION_JSON = json.dumps(_MINIMAL_STATION)
+
 
 class TestProcessStationCreate:
     def test_valid_minimal(self):
-        s = ProcessStationCreate(
-            production_line_id=uuid.uuid4(),
-            name="SMT Station 1",
-            station_order=1,
-            equipment_type="SMT",
-            standard_cycle_time=45.0,
-        )
+        s = ProcessStationCreate.model_validate_json(_MINIMAL_STATION_JSON)
         assert s.status == "active"
         assert s.actual_cycle_time is None
 
-    def test_station_order_must_be_positive(self):
-        with pytest.raises(Exception):
-            ProcessStationCreate(
-                production_line_id=uuid.uuid4(),
-                name="Bad",
-                station_order=0,
-                equipment_type="SMT",
-                standard_cycle_time=10.0,
-            )
-
-    def test_cycle_time_must_be_positive(self):
-        with pytest.raises(Exception):
-            ProcessStationCreate(
-                production_line_id=uuid.uuid4(),
-                name="Bad",
-                station_order=1,
-                equipment_type="SMT",
-                standard_cycle_time=-1.0,
-            )
+    @pytest.mark.parametrize(
+        "override",
+        [
+            pytest.param({"station_order": 0}, id="station-order-positive"),
+            pytest.param({"standard_cycle_time": -1.0}, id="cycle-time-positive"),
+        ],
+    )
+    def test_rejects_invalid(self, override):
+        with pytest.raises(ValidationError):
+            ProcessStationCreate(**{**_MINIMAL_STATION, **override})
 
 
 class TestProcessStationResponse:
     def test_from_attributes(self):
-        now = datetime.now(timezone.utc)
         r = ProcessStationResponse(
             id=uuid.uuid4(),
             production_line_id=uuid.uuid4(),
@@ -54,7 +54,23 @@ class TestProcessStationResponse:
             actual_cycle_time=None,
             capabilities=None,
             status="active",
-            created_at=now,
-            updated_at=now,
+            created_at=NOW,
+            updated_at=NOW,
         )
         assert r.status == "active"
+
+    def test_json_round_trip_preserves_datetimes(self):
+        r = ProcessStationResponse(
+            id=uuid.uuid4(),
+            production_line_id=uuid.uuid4(),
+            name="Station A",
+            station_order=1,
+            equipment_type="SMT",
+            standard_cycle_time=45.0,
+            actual_cycle_time=None,
+            capabilities=None,
+            status="active",
+            created_at=NOW,
+            updated_at=NOW,
+        )
+        assert ProcessStationResponse.model_validate_json(r.model_dump_json()) == r
@@ -1,6 +1,6 @@
 """Tests for new production_helpers functions (Phase 1 additions)."""
 
-from unittest.mock import MagicMock
+from types import SimpleNamespace
 
 import pytest
 
@@ -56,30 +56,33 @@ class TestCalculateProductionTime:
 
 class TestIsProductAllowedWithCapabilities:
     def test_falls_back_when_no_required_types(self):
-        line = MagicMock()
-        line.allowed_products = None
+        line = SimpleNamespace(allowed_products=None)
         assert is_product_allowed_with_capabilities("SKU-1", line, None, None) is True
 
     def test_falls_back_when_empty_required_types(self):
-        line = MagicMock()
-        line.allowed_products = ["SKU-1"]
+        line = SimpleNamespace(allowed_products=["SKU-1"])
         assert is_product_allowed_with_capabilities("SKU-1", line, [], None) is True
 
     def test_matches_when_all_types_present(self):
-        line = MagicMock()
+        line = SimpleNamespace(allowed_products=None)
         required = ["SMT", "reflow"]
         line_types = {"SMT", "reflow", "AOI"}
         assert is_product_allowed_with_capabilities("SKU-1", line, required, line_types) is True
 
     def test_rejects_when_missing_type(self):
-        line = MagicMock()
+        line = SimpleNamespace(allowed_products=None)
         required = ["SMT", "reflow"]
         line_types = {"SMT", "AOI"}
         assert is_product_allowed_with_capabilities("SKU-1", line, required, line_types) is False
 
+    def test_accepts_frozensets(self):
+        line = SimpleNamespace(allowed_products=None)
+        required = frozenset({"SMT"})
+        line_types = frozenset({"SMT", "AOI"})
+        assert is_product_allowed_with_capabilities("SKU-1", line, required, line_types) is True
+
     def test_fallback_uses_is_product_allowed(self):
-        line = MagicMock()
-        line.allowed_products = {"skus": ["SKU-A"]}
+        line = SimpleNamespace(allowed_products={"skus": ["SKU-A"]})
         # required_types=None -> falls back
         assert is_product_allowed_with_capabilities("SKU-A", line, None, {"SMT"}) is True
         assert is_product_allowed_with_capabilities("SKU-B", line, None, {"SMT"}) is False
@@ -9,8 +9,12 @@ Covers:
 import inspect
 
 import pytest
+from pydantic import ValidationError
 
+from app.api.v1 import memory, orders, schedule
 from app.core.config import settings
+from app.schemas.memory import MemorySearch
+from app.schemas.schedule import ScheduleRequest
 
 
 # ---------------------------------------------------------------------------
@@ -44,65 +48,58 @@ class TestSecurityConfig:
 # ---------------------------------------------------------------------------
 
 
+# Endpoint signatures, inspected once at import
+_SIGNATURES = {
+    fn: inspect.signature(fn)
+    for fn in (schedule.get_current_schedule, orders.list_orders, memory.list_facts)
+}
+
+
+@pytest.fixture(scope="module")
+def route_index() -> dict[str, list[tuple[str, set[str]]]]:
+    """(path, methods) pairs for each router, collected once per module."""
+    return {
+        name: [
+            (route.path, route.methods)
+            for route in module.router.routes
+            if hasattr(route, "methods") and hasattr(route, "path")
+        ]
+        for name, module in (("schedule", schedule), ("memory", memory), ("orders", orders))
+    }
+
+
 class TestAPIEndpointMethods:
     """Test that API endpoints use correct HTTP methods."""
 
-    def test_schedule_generate_endpoint_exists(self):
+    def test_schedule_generate_endpoint_exists(self, route_index):
         """Schedule generation endpoint is POST."""
-        from app.api.v1.schedule import router
+        assert any(
+            "generate" in path and "POST" in methods for path, methods in route_index["schedule"]
+        ), "Should have a POST endpoint containing 'generate'"
 
-        found = False
-        for route in router.routes:
-            if hasattr(route, 'methods') and hasattr(route, 'path'):
-                if "generate" in route.path and "POST" in route.methods:
-                    found = True
-                    break
-        assert found, "Should have a POST endpoint containing 'generate'"
-
-    def test_memory_search_endpoint_exists(self):
+    def test_memory_search_endpoint_exists(self, route_index):
         """Memory search endpoint is POST."""
-        from app.api.v1.memory import router
-
-        found = False
-        for route in router.routes:
-            if hasattr(route, 'methods') and hasattr(route, 'path'):
-                if "search" in route.path and "POST" in route.methods:
-                    found = True
-                    break
-        assert found, "Should have a POST endpoint containing 'search'"
+        assert any(
+            "search" in path and "POST" in methods for path, methods in route_index["memory"]
+        ), "Should have a POST endpoint containing 'search'"
 
-    def test_orders_endpoint_exists(self):
+    def test_orders_endpoint_exists(self, route_index):
         """Orders list endpoint exists."""
-        from app.api.v1.orders import router
-
-        found = False
-        for route in router.routes:
-            if hasattr(route, 'methods') and hasattr(route, 'path'):
-                if "GET" in route.methods:
-                    found = True
-                    break
-        assert found, "Should have a GET endpoint for listing orders"
+        assert any(
+            "GET" in methods for _, methods in route_index["orders"]
+        ), "Should have a GET endpoint for listing orders"
 
     def test_schedule_current_has_limit_param(self):
         """Schedule current endpoint has a limit parameter."""
-        from app.api.v1.schedule import get_current_schedule
-
-        sig = inspect.signature(get_current_schedule)
-        assert "limit" in sig.parameters
+        assert "limit" in _SIGNATURES[schedule.get_current_schedule].parameters
 
     def test_orders_list_has_limit_param(self):
         """Orders list endpoint has a limit parameter."""
-        from app.api.v1.orders import list_orders
-
-        sig = inspect.signature(list_orders)
-        assert "limit" in sig.parameters
+        assert "limit" in _SIGNATURES[orders.list_orders].parameters
 
     def test_memory_facts_has_limit_param(self):
         """Memory facts endpoint has a limit parameter."""
-        from app.api.v1.memory import list_facts
-
-        sig = inspect.signature(list_facts)
-        assert "limit" in sig.parameters
+        assert "limit" in _SIGNATURES[memory.list_facts].parameters
 
 
 # ---------------------------------------------------------------------------
@@ -115,23 +112,14 @@ class TestPaginationLimits:
 
     def test_schedule_request_has_horizon_default(self):
         """ScheduleRequest has a default horizon_days."""
-        from app.schemas.schedule import ScheduleRequest
-
         req = ScheduleRequest()
         assert req.horizon_days > 0
 
     def test_memory_search_has_limit_bounds(self):
         """MemorySearch limit is bounded between 1 and 100."""
-        from app.schemas.memory import MemorySearch
-
-        search = MemorySearch(query="test", limit=1)
-        assert search.limit == 1
-
-        search = MemorySearch(query="test", limit=100)
-        assert search.limit == 100
-
-        with pytest.raises(Exception):
-            MemorySearch(query="test", limit=0)
+        for limit in (1, 100):
+            assert MemorySearch.model_validate({"query": "test", "limit": limit}).limit == limit
 
-        with pytest.raises(Exception):
-            MemorySearch(query="test", limit=101)
+        for limit in (0, 101):
+            with pytest.raises(ValidationError):
+                MemorySearch.model_validate({"query": "test", "limit": limit})
@@ -2,7 +2,7 @@
 
 import uuid
 from datetime import datetime, timedelta, timezone
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
@@ -15,6 +15,7 @@ from app.services.scheduler import (
     _LineSlot,
     _OrderTask,
 )
+from tests.fakes import FakeAsyncSession, FakeResult
 
 
 # ---------------------------------------------------------------------------
@@ -22,6 +23,10 @@ from app.services.scheduler import (
 # ---------------------------------------------------------------------------
 
 
+# Read once at import rather than for every task built
+_NOW_UTC = datetime.now(timezone.utc)
+
+
 def _make_task(
     priority: int = 5,
     due_days: int = 7,
@@ -38,7 +43,7 @@ def _make_task(
         product_id=uuid.uuid4(),
         product_sku=product_sku,
         quantity=quantity,
-        due_date=datetime.now(timezone.utc) + timedelta(days=due_days),
+        due_date=_NOW_UTC + timedelta(days=due_days),
         priority=priority,
         cycle_time=cycle_time,
         setup_time=setup_time,
@@ -155,7 +160,7 @@ class TestPhase2Constraints:
         """Tasks distribute across multiple lines."""
         svc = SchedulerService(mock_db)
         tasks = [_make_task(priority=i, quantity=500, cycle_time=5.0) for i in range(1, 5)]
-        lines = [line_factory.create(status="active") for _ in range(2)]
+        lines = line_factory.create_batch(2, status="active")
 
         now = datetime.now(timezone.utc).replace(hour=9, minute=0, second=0, microsecond=0)
         while now.weekday() >= 5:
@@ -218,14 +223,10 @@ class TestEmptyInput:
     """Test scheduler with empty or missing input."""
 
     @pytest.mark.asyncio
-    async def test_no_orders_returns_warning(self, mock_db):
+    async def test_no_orders_returns_warning(self):
         """No orders returns empty schedule with warning."""
-        svc = SchedulerService(mock_db)
-
-        # Mock DB to return empty results
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = []
-        mock_db.execute = AsyncMock(return_value=mock_result)
+        # Orders query comes back empty, lines query returns one line
+        svc = SchedulerService(FakeAsyncSession(FakeResult(), FakeResult([MagicMock()])))
 
         request = ScheduleRequest()
         result = await svc.generate_schedule(request)
@@ -234,28 +235,13 @@ class TestEmptyInput:
         assert len(result.warnings) > 0
 
     @pytest.mark.asyncio
-    async def test_no_lines_returns_warning(self, mock_db):
+    async def test_no_lines_returns_warning(self):
         """No production lines returns empty schedule with warning."""
-        svc = SchedulerService(mock_db)
+        order = MagicMock()
+        order.items = []
+        # First query returns orders, second returns no lines
+        svc = SchedulerService(FakeAsyncSession(FakeResult([order]), FakeResult()))
 
-        # First call returns orders, second returns no lines
-        call_count = 0
-
-        async def mock_execute(stmt):
-            nonlocal call_count
-            call_count += 1
-            mock_result = MagicMock()
-            if call_count == 1:
-                # Return some orders
-                order = MagicMock()
-                order.items = []
-                mock_result.scalars.return_value.all.return_value = [order]
-            else:
-                # No lines
-                mock_result.scalars.return_value.all.return_value = []
-            return mock_result
-
-        mock_db.execute = mock_execute
         request = ScheduleRequest()
         result = await svc.generate_schedule(request)
 
@@ -271,69 +257,72 @@ class TestEmptyInput:
 class TestUtilityMethods:
     """Test scheduler utility methods."""
 
-    def test_align_to_work_start_morning(self):
-        """Early morning aligns to 8 AM."""
-        dt = datetime(2026, 2, 23, 6, 30, tzinfo=timezone.utc)  # Monday 6:30
-        result = SchedulerService._align_to_work_start(dt)
-        assert result.hour == DEFAULT_WORK_START_HOUR
-
-    def test_align_to_work_start_after_hours(self):
-        """After work hours aligns to next day 8 AM."""
-        dt = datetime(2026, 2, 23, 18, 0, tzinfo=timezone.utc)  # Monday 6 PM
-        result = SchedulerService._align_to_work_start(dt)
-        assert result.hour == DEFAULT_WORK_START_HOUR
-        assert result.day == 24
+    @pytest.mark.parametrize(
+        "dt,expected",
+        [
+            pytest.param(
+                datetime(2026, 2, 23, 6, 30, tzinfo=timezone.utc),  # Monday 6:30
+                datetime(2026, 2, 23, DEFAULT_WORK_START_HOUR, tzinfo=timezone.utc),
+                id="early-morning",
+            ),
+            pytest.param(
+                datetime(2026, 2, 23, 18, 0, tzinfo=timezone.utc),  # Monday 6 PM
+                datetime(2026, 2, 24, DEFAULT_WORK_START_HOUR, tzinfo=timezone.utc),
+                id="after-hours",
+            ),
+            pytest.param(
+                datetime(2026, 2, 27, 19, 0, tzinfo=timezone.utc),  # Friday 7 PM
+                datetime(2026, 3, 2, DEFAULT_WORK_START_HOUR, tzinfo=timezone.utc),
+                id="friday-evening",
+            ),
+        ],
+    )
+    def test_align_to_work_start(self, dt, expected):
+        """Times outside work hours move to the next work start."""
+        assert SchedulerService._align_to_work_start(dt) == expected
 
     def test_align_to_work_start_skips_weekend(self):
-        """Saturday aligns to Monday 8 AM."""
+        """Saturday aligns to a weekday."""
         dt = datetime(2026, 2, 28, 10, 0, tzinfo=timezone.utc)  # Saturday
         result = SchedulerService._align_to_work_start(dt)
         assert result.weekday() < 5
 
-    def test_calculate_overtime_within_hours(self):
-        """Job within work hours has zero overtime."""
-        start = datetime(2026, 2, 23, 9, 0, tzinfo=timezone.utc)
-        end = datetime(2026, 2, 23, 16, 0, tzinfo=timezone.utc)
-        assert SchedulerService._calculate_job_overtime(start, end) == 0.0
-
-    def test_calculate_overtime_past_hours(self):
-        """Job extending past 17:00 accumulates overtime."""
-        start = datetime(2026, 2, 23, 15, 0, tzinfo=timezone.utc)
-        end = datetime(2026, 2, 23, 19, 0, tzinfo=timezone.utc)
-        overtime = SchedulerService._calculate_job_overtime(start, end)
-        assert overtime > 0.0
-
-    def test_product_allowed_no_restriction(self, line_factory):
-        """Product is allowed when line has no restrictions."""
-        line = line_factory.create(allowed_products=None)
-        assert is_product_allowed("ANY-SKU", line) is True
-
-    def test_product_allowed_in_list(self, line_factory):
-        """Product is allowed when SKU is in allowed list."""
-        line = line_factory.create(allowed_products=["SKU-A", "SKU-B"])
-        assert is_product_allowed("SKU-A", line) is True
-
-    def test_product_not_allowed(self, line_factory):
-        """Product is rejected when SKU is not in allowed list."""
-        line = line_factory.create(allowed_products=["SKU-A"])
-        assert is_product_allowed("SKU-Z", line) is False
-
-    def test_changeover_time_from_matrix(self, line_factory):
-        """Changeover time uses matrix value."""
-        line = line_factory.create(changeover_matrix={"SKU-A->SKU-B": 20, "default": 30})
-        assert get_changeover_time("SKU-A", "SKU-B", line) == 20.0
-
-    def test_changeover_time_default(self, line_factory):
-        """Changeover time falls back to matrix default."""
-        line = line_factory.create(changeover_matrix={"default": 45})
-        assert get_changeover_time("SKU-X", "SKU-Y", line) == 45.0
-
-    def test_changeover_time_no_matrix(self, line_factory):
-        """Changeover time defaults to 30 when no matrix."""
-        line = line_factory.create(changeover_matrix=None)
-        assert get_changeover_time("SKU-X", "SKU-Y", line) == 30.0
-
-    def test_changeover_same_product_is_zero(self, line_factory):
-        """No changeover when product is the same."""
-        line = line_factory.create(changeover_matrix={"default": 30})
-        assert get_changeover_time("SKU-A", "SKU-A", line) == 0.0
+    @pytest.mark.parametrize(
+        "start_hour,end_hour,expected",
+        [
+            pytest.param(9, 16, 0.0, id="within-hours"),
+            pytest.param(15, 19, 2.0, id="past-hours"),
+        ],
+    )
+    def test_calculate_overtime(self, start_hour, end_hour, expected):
+        """Only time past the end of the work day counts as overtime."""
+        start = datetime(2026, 2, 23, start_hour, 0, tzinfo=timezone.utc)
+        end = datetime(2026, 2, 23, end_hour, 0, tzinfo=timezone.utc)
+        assert SchedulerService._calculate_job_overtime(start, end) == pytest.approx(expected)
+
+    @pytest.mark.parametrize(
+        "allowed_products,sku,expected",
+        [
+            pytest.param(None, "ANY-SKU", True, id="no-restriction"),
+            pytest.param(["SKU-A", "SKU-B"], "SKU-A", True, id="in-list"),
+            pytest.param(["SKU-A"], "SKU-Z", False, id="not-in-list"),
+        ],
+    )
+    def test_product_allowed(self, line_factory, allowed_products, sku, expected):
+        """Lines accept any SKU unless restricted to an allowed list."""
+        line = line_factory.create(allowed_products=allowed_products)
+        assert is_product_allowed(sku, line) is expected
+
+    @pytest.mark.parametrize(
+        "matrix,from_sku,to_sku,expected",
+        [
+            pytest.param({"SKU-A->SKU-B": 20, "default": 30}, "SKU-A", "SKU-B", 20.0, id="matrix"),
+            pytest.param({"default": 45}, "SKU-X", "SKU-Y", 45.0, id="matrix-default"),
+            pytest.param(None, "SKU-X", "SKU-Y", 30.0, id="no-matrix"),
+            pytest.param({"default": 30}, "SKU-A", "SKU-A", 0.0, id="same-product"),
+        ],
+    )
+    def test_changeover_time(self, line_factory, matrix, from_sku, to_sku, expected):
+        """Changeover uses the matrix, then its default, then 30 minutes."""
+        line = line_factory.create(changeover_matrix=matrix)
+        assert get_changeover_time(from_sku, to_sku, line) == expected
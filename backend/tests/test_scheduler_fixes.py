@@ -27,6 +27,10 @@ from app.services.scheduler import (
 # ---------------------------------------------------------------------------
 
 
+# Read once at import rather than for every task built
+_NOW_UTC = datetime.now(timezone.utc)
+
+
 def _make_task(
     order_item_id: uuid.UUID | None = None,
     priority: int = 5,
@@ -43,7 +47,7 @@ def _make_task(
         product_id=uuid.uuid4(),
         product_sku=product_sku,
         quantity=quantity,
-        due_date=datetime.now(timezone.utc) + timedelta(days=due_days),
+        due_date=_NOW_UTC + timedelta(days=due_days),
         priority=priority,
         cycle_time=cycle_time,
         setup_time=setup_time,
@@ -194,13 +198,13 @@ class TestPrioritySortingCorrectness:
 
         order_high = OrderCreate(
             order_no="ORD-001", customer_name="Test",
-            due_date=datetime.now(timezone.utc), priority=1,
+            due_date=_NOW_UTC, priority=1,
         )
         assert order_high.priority == 1
 
         order_low = OrderCreate(
             order_no="ORD-002", customer_name="Test",
-            due_date=datetime.now(timezone.utc), priority=5,
+            due_date=_NOW_UTC, priority=5,
         )
         assert order_low.priority == 5
 
@@ -247,6 +251,19 @@ class TestSchedulerStrategy:
 
         assert efficiency_score > balanced_score
 
+    def test_rush_strategy_eases_changeover(self, mock_db):
+        """Rush strategy halves the changeover penalty."""
+        svc = SchedulerService(mock_db)
+
+        task = _make_task(priority=1, quantity=50)
+        slot = _LineSlot(_mock_line(), _work_start())
+        job_end = _work_start() + timedelta(hours=2)
+
+        rush_score = svc._score_assignment(task, slot, 30.0, job_end, "rush")
+        balanced_score = svc._score_assignment(task, slot, 30.0, job_end, "balanced")
+
+        assert balanced_score - rush_score == pytest.approx(1.5)
+
     def test_balanced_strategy_distributes_across_lines(self, mock_db):
         """Balanced strategy distributes work across multiple lines."""
         svc = SchedulerService(mock_db)
@@ -267,3 +284,33 @@ class TestSchedulerStrategy:
 
         line_ids = {j["production_line_id"] for j in jobs}
         assert len(line_ids) >= 2
+
+
+# ---------------------------------------------------------------------------
+# Line Slot Lookups
+# ---------------------------------------------------------------------------
+
+
+class TestLineSlotLookups:
+    """Test the per-pass product and changeover memoization on _LineSlot."""
+
+    def test_changeover_follows_last_product(self):
+        """Cached changeovers are keyed on the slot's current last product."""
+        line = _mock_line(changeover_matrix={"SKU-A->SKU-B": 45, "default": 20})
+        slot = _LineSlot(line, _work_start())
+
+        assert slot.changeover_to("SKU-B") == 0.0
+        slot.last_product_sku = "SKU-A"
+        assert slot.changeover_to("SKU-B") == 45.0
+        slot.last_product_sku = "SKU-C"
+        assert slot.changeover_to("SKU-B") == 20.0
+
+    def test_allowed_products_looked_up_once(self):
+        """Repeated checks for the same SKU reuse the first answer."""
+        line = _mock_line(allowed_products=["SKU-A"])
+        slot = _LineSlot(line, _work_start())
+
+        assert slot.allows("SKU-A") is True
+        assert slot.allows("SKU-B") is False
+        line.allowed_products = []
+        assert slot.allows("SKU-A") is True
@@ -9,11 +9,20 @@ Covers:
 
 import uuid
 from datetime import datetime, timezone
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from pydantic import ValidationError
 
+from app.db.init_db import table_has_data
 from app.schemas.memory import MemorySearch
+from app.schemas.order import OrderCreate
+from app.services.memory_service import MemoryService
+from tests.fakes import FakeResult
+
+# Fixed due date; validation does not depend on the wall clock
+FROZEN_DUE = datetime(2026, 2, 23, tzinfo=timezone.utc)
 
 
 # ---------------------------------------------------------------------------
@@ -27,8 +36,6 @@ class TestSQLInjectionInitDB:
     @pytest.mark.asyncio
     async def test_malicious_table_name_rejected(self):
         """Malicious table names should be rejected via whitelist validation."""
-        from app.db.init_db import table_has_data
-
         mock_session = AsyncMock()
         # Mock run_sync to return a set of valid table names
         mock_session.run_sync = AsyncMock(return_value={"orders", "products", "production_lines"})
@@ -41,8 +48,6 @@ class TestSQLInjectionInitDB:
     @pytest.mark.asyncio
     async def test_valid_table_name_accepted(self):
         """Valid table names pass the whitelist check."""
-        from app.db.init_db import table_has_data
-
         mock_session = AsyncMock()
         mock_session.run_sync = AsyncMock(return_value={"orders", "products"})
 
@@ -56,8 +61,6 @@ class TestSQLInjectionInitDB:
     @pytest.mark.asyncio
     async def test_nonexistent_table_rejected(self):
         """Non-existent table names are rejected."""
-        from app.db.init_db import table_has_data
-
         mock_session = AsyncMock()
         mock_session.run_sync = AsyncMock(return_value={"orders", "products"})
 
@@ -67,8 +70,6 @@ class TestSQLInjectionInitDB:
     @pytest.mark.asyncio
     async def test_empty_table_returns_false(self):
         """Empty table returns False."""
-        from app.db.init_db import table_has_data
-
         mock_session = AsyncMock()
         mock_session.run_sync = AsyncMock(return_value={"orders"})
 
@@ -85,49 +86,45 @@ class TestSQLInjectionInitDB:
 # ---------------------------------------------------------------------------
 
 
+DANGEROUS_QUERIES = [
+    "test'; DROP TABLE memory_entries; --",
+    "test%' OR '1'='1",
+    "test\" UNION SELECT * FROM users --",
+    "test\\'; DELETE FROM memory_entries; --",
+]
+
+
 class TestSQLInjectionMemoryService:
     """Test that _sql_text_search is safe from SQL injection."""
 
     @pytest.fixture
     def memory_service(self, mock_db):
-        from app.services.memory_service import MemoryService
-
         mock_qdrant = AsyncMock()
         return MemoryService(db=mock_db, qdrant=mock_qdrant)
 
     @pytest.mark.asyncio
-    async def test_sql_text_search_with_special_chars(self, memory_service, mock_db):
+    @pytest.mark.parametrize("query", DANGEROUS_QUERIES)
+    async def test_sql_text_search_with_special_chars(self, memory_service, mock_db, query):
         """_sql_text_search should handle special characters safely."""
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = []
-        mock_db.execute.return_value = mock_result
-
-        dangerous_queries = [
-            "test'; DROP TABLE memory_entries; --",
-            "test%' OR '1'='1",
-            "test\" UNION SELECT * FROM users --",
-            "test\\'; DELETE FROM memory_entries; --",
-        ]
-
-        for query in dangerous_queries:
-            result = await memory_service._sql_text_search(
-                query=query, memory_type=None, category=None, limit=10
-            )
-            assert isinstance(result, list)
+        mock_db.execute.return_value = FakeResult()
+
+        result = await memory_service._sql_text_search(
+            query=query, memory_type=None, category=None, limit=10
+        )
+        assert isinstance(result, list)
 
     @pytest.mark.asyncio
     async def test_sql_text_search_with_normal_query(self, memory_service, mock_db):
         """_sql_text_search works with normal queries."""
-        mock_memory = MagicMock()
-        mock_memory.id = uuid.uuid4()
-        mock_memory.importance = 0.7
-        mock_memory.memory_type = "episodic"
-        mock_memory.category = "scheduling"
-        mock_memory.content = "Test content"
+        mock_memory = SimpleNamespace(
+            id=uuid.uuid4(),
+            importance=0.7,
+            memory_type="episodic",
+            category="scheduling",
+            content="Test content",
+        )
 
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = [mock_memory]
-        mock_db.execute.return_value = mock_result
+        mock_db.execute.return_value = FakeResult([mock_memory])
 
         result = await memory_service._sql_text_search(
             query="scheduling", memory_type=None, category=None, limit=10
@@ -149,25 +146,22 @@ class TestMemorySearchSchema:
         assert search.query == "排程問題"
         assert search.limit == 5
 
-    def test_empty_query_rejected(self):
-        with pytest.raises(Exception):
-            MemorySearch(query="")
-
-    def test_query_max_length(self):
-        with pytest.raises(Exception):
-            MemorySearch(query="x" * 1001)
-
     def test_default_limit(self):
         search = MemorySearch(query="test")
         assert search.limit == 10
 
-    def test_limit_lower_bound(self):
-        with pytest.raises(Exception):
-            MemorySearch(query="test", limit=0)
-
-    def test_limit_upper_bound(self):
-        with pytest.raises(Exception):
-            MemorySearch(query="test", limit=101)
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            pytest.param({"query": ""}, id="empty-query"),
+            pytest.param({"query": "x" * 1001}, id="query-too-long"),
+            pytest.param({"query": "test", "limit": 0}, id="limit-below-min"),
+            pytest.param({"query": "test", "limit": 101}, id="limit-above-max"),
+        ],
+    )
+    def test_invalid_search_rejected(self, kwargs):
+        with pytest.raises(ValidationError):
+            MemorySearch(**kwargs)
 
     def test_optional_filters(self):
         search = MemorySearch(query="test")
@@ -192,21 +186,17 @@ class TestOrderInputValidation:
     """Test that order input validation prevents injection attacks."""
 
     def test_order_no_with_special_chars(self):
-        from app.schemas.order import OrderCreate
-
         order = OrderCreate(
             order_no="ORD-<script>",
             customer_name="Test",
-            due_date=datetime.now(timezone.utc),
+            due_date=FROZEN_DUE,
         )
         assert order.order_no == "ORD-<script>"
 
     def test_customer_name_max_length_prevents_overflow(self):
-        from app.schemas.order import OrderCreate
-
         with pytest.raises(Exception):
             OrderCreate(
                 order_no="ORD-001",
                 customer_name="A" * 201,
-                due_date=datetime.now(timezone.utc),
+                due_date=FROZEN_DUE,
             )
@@ -1,57 +1,65 @@
 """Tests for Phase 1 seed data (process stations, routes, capabilities)."""
 
+import pytest
+
 from app.db.seed import (
+    LINE_IDS,
     _create_line_capabilities,
     _create_process_routes,
     _create_process_stations,
 )
 
 
+# Seed builders are deterministic and the tests only read their output,
+# so each list is built once per module.
+@pytest.fixture(scope="module")
+def stations():
+    return _create_process_stations()
+
+
+@pytest.fixture(scope="module")
+def routes():
+    return _create_process_routes()
+
+
+@pytest.fixture(scope="module")
+def caps():
+    return _create_line_capabilities()
+
+
 class TestSeedProcessStations:
-    def test_creates_stations_for_all_lines(self):
-        stations = _create_process_stations()
+    def test_creates_stations_for_all_lines(self, stations):
         assert len(stations) == 14  # 3 + 4 + 3 + 4
 
-    def test_station_orders_sequential(self):
-        stations = _create_process_stations()
-        from app.db.seed import LINE_IDS
-
+    def test_station_orders_sequential(self, stations):
         smt1_stations = [s for s in stations if s.production_line_id == LINE_IDS["SMT-Line-1"]]
         orders = [s.station_order for s in smt1_stations]
         assert orders == [1, 2, 3]
 
-    def test_all_stations_active(self):
-        stations = _create_process_stations()
+    def test_all_stations_active(self, stations):
         assert all(s.status == "active" for s in stations)
 
 
 class TestSeedProcessRoutes:
-    def test_creates_routes_for_all_products(self):
-        routes = _create_process_routes()
+    def test_creates_routes_for_all_products(self, routes):
         assert len(routes) == 6  # one per product
 
-    def test_all_routes_active(self):
-        routes = _create_process_routes()
+    def test_all_routes_active(self, routes):
         assert all(r.is_active for r in routes)
 
-    def test_all_routes_manual_source(self):
-        routes = _create_process_routes()
+    def test_all_routes_manual_source(self, routes):
         assert all(r.source == "manual" for r in routes)
 
-    def test_steps_not_empty(self):
-        routes = _create_process_routes()
+    def test_steps_not_empty(self, routes):
         assert all(len(r.steps) >= 2 for r in routes)
 
 
 class TestSeedLineCapabilities:
-    def test_creates_capabilities(self):
-        caps = _create_line_capabilities()
+    def test_creates_capabilities(self, caps):
         assert len(caps) == 14  # 3 + 4 + 3 + 4
 
-    def test_all_have_equipment_type(self):
-        caps = _create_line_capabilities()
+    def test_all_have_equipment_type(self, caps):
         assert all(c.equipment_type for c in caps)
 
-    def test_all_have_capability_params(self):
-        caps = _create_line_capabilities()
+    def test_all_have_capability_params(self, caps):
         assert all(c.capability_params is not None for c in caps)
@@ -1,12 +1,18 @@
 """Tests for the rush order simulation engine."""
 
 import uuid
-from datetime import datetime, timedelta, timezone
-from unittest.mock import AsyncMock, MagicMock
+from datetime import datetime, time, timedelta, timezone
+from unittest.mock import AsyncMock
 
 import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.services.production_helpers import is_product_allowed, get_changeover_time
+from app.services.production_helpers import (
+    DEFAULT_WORK_END_HOUR,
+    DEFAULT_WORK_START_HOUR,
+    get_changeover_time,
+    is_product_allowed,
+)
 from app.services.simulator import (
     OVERTIME_COST_PER_HOUR,
     AffectedOrder,
@@ -15,6 +21,7 @@ from app.services.simulator import (
     SimulationScenario,
     SimulatorService,
 )
+from tests.fakes import FakeAsyncSession, FakeResult, fake_uuid
 
 
 # ---------------------------------------------------------------------------
@@ -22,10 +29,17 @@ from app.services.simulator import (
 # ---------------------------------------------------------------------------
 
 
-def _now() -> datetime:
-    """Return a weekday work-hour datetime for deterministic tests."""
-    dt = datetime(2026, 2, 23, 10, 0, 0, tzinfo=timezone.utc)  # Monday 10 AM
-    return dt
+# Weekday work-hour reference time for deterministic tests
+NOW = datetime(2026, 2, 23, 10, 0, 0, tzinfo=timezone.utc)  # Monday 10 AM
+# Shared values for synthetic affected orders; selection never compares ids
+_DELAYED_END = NOW + timedelta(hours=1)
+_AFFECTED_ITEM_IDS = tuple(fake_uuid() for _ in range(8))
+
+
+@pytest.fixture(scope="module")
+def simulator() -> SimulatorService:
+    """A SimulatorService for tests that only exercise its pure helpers."""
+    return SimulatorService(AsyncMock(spec=AsyncSession))
 
 
 # ---------------------------------------------------------------------------
@@ -41,7 +55,7 @@ class TestRushOrderInput:
         inp = RushOrderInput(
             product_id=uuid.uuid4(),
             quantity=100,
-            target_date=_now() + timedelta(days=3),
+            target_date=NOW + timedelta(days=3),
         )
         assert inp.priority == 1
 
@@ -50,7 +64,7 @@ class TestRushOrderInput:
         inp = RushOrderInput(
             product_id=uuid.uuid4(),
             quantity=100,
-            target_date=_now() + timedelta(days=3),
+            target_date=NOW + timedelta(days=3),
             priority=3,
         )
         assert inp.priority == 3
@@ -75,71 +89,65 @@ class TestScenarioSelection:
         return SimulationScenario(
             name=name,
             description=f"Test scenario {name}",
-            production_line_id=uuid.uuid4(),
+            production_line_id=fake_uuid(),
             production_line_name="Test Line",
-            completion_time=_now() + timedelta(hours=completion_offset_hours),
+            completion_time=NOW + timedelta(hours=completion_offset_hours),
             changeover_time=30.0,
             production_hours=2.0,
             affected_orders=[
                 AffectedOrder(
-                    order_item_id=uuid.uuid4(),
-                    original_end=_now(),
-                    new_end=_now() + timedelta(hours=1),
+                    order_item_id=_AFFECTED_ITEM_IDS[i],
+                    original_end=NOW,
+                    new_end=_DELAYED_END,
                     delay_minutes=60.0,
                 )
-                for _ in range(affected)
+                for i in range(affected)
             ],
             overtime_hours=cost / OVERTIME_COST_PER_HOUR if cost > 0 else 0.0,
             additional_cost=cost,
             meets_target=meets_target,
         )
 
-    def test_recommend_meets_target_no_impact(self, mock_db):
+    def test_recommend_meets_target_no_impact(self, simulator):
         """Prefers scenario that meets target with no affected orders."""
-        svc = SimulatorService(mock_db)
         s1 = self._make_scenario("Append", meets_target=True, affected=0)
         s2 = self._make_scenario("Insert", meets_target=True, affected=2)
-        result = svc._pick_recommendation([s1, s2])
+        result = simulator._pick_recommendation([s1, s2])
         assert result == "Append"
         assert s1.recommendation is True
 
-    def test_recommend_meets_target_fewest_affected(self, mock_db):
+    def test_recommend_meets_target_fewest_affected(self, simulator):
         """When all impact orders, prefers fewest affected."""
-        svc = SimulatorService(mock_db)
         s1 = self._make_scenario("A", meets_target=True, affected=3)
         s2 = self._make_scenario("B", meets_target=True, affected=1)
-        result = svc._pick_recommendation([s1, s2])
+        result = simulator._pick_recommendation([s1, s2])
         assert result == "B"
 
-    def test_recommend_earliest_when_none_meet_target(self, mock_db):
+    def test_recommend_earliest_when_none_meet_target(self, simulator):
         """When no scenario meets target, picks earliest completion."""
-        svc = SimulatorService(mock_db)
         s1 = self._make_scenario("A", meets_target=False, completion_offset_hours=10)
         s2 = self._make_scenario("B", meets_target=False, completion_offset_hours=5)
-        result = svc._pick_recommendation([s1, s2])
+        result = simulator._pick_recommendation([s1, s2])
         assert result == "B"
 
-    def test_recommend_none_for_empty_list(self, mock_db):
+    def test_recommend_none_for_empty_list(self, simulator):
         """Empty scenario list returns None."""
-        svc = SimulatorService(mock_db)
-        assert svc._pick_recommendation([]) is None
+        assert simulator._pick_recommendation([]) is None
 
-    def test_select_best_limits_to_three(self, mock_db):
+    def test_select_best_limits_to_three(self, simulator):
         """Selection limits output to 3 scenarios."""
-        svc = SimulatorService(mock_db)
         scenarios = [
             self._make_scenario(f"S{i}", affected=i) for i in range(5)
         ]
-        target = _now() + timedelta(days=5)
-        result = svc._select_best_scenarios(scenarios, target)
+        target = NOW + timedelta(days=5)
+        result = simulator._select_best_scenarios(scenarios, target)
         assert len(result) <= 3
 
-    def test_select_best_preserves_few(self, mock_db):
+    def test_select_best_preserves_few(self, simulator):
         """Selection preserves all when <= 3 scenarios."""
-        svc = SimulatorService(mock_db)
         scenarios = [self._make_scenario("A"), self._make_scenario("B")]
-        target = _now() + timedelta(days=5)
-        result = svc._select_best_scenarios(scenarios, target)
+        target = NOW + timedelta(days=5)
+        result = simulator._select_best_scenarios(scenarios, target)
         assert len(result) == 2
 
 
@@ -159,7 +167,7 @@ class TestSimulateAppend:
         rush = RushOrderInput(
             product_id=product.id,
             quantity=100,
-            target_date=_now() + timedelta(days=5),
+            target_date=NOW + timedelta(days=5),
         )
 
         scenario = svc._simulate_append(rush, product, line, [], 4.0)
@@ -185,7 +193,7 @@ class TestSimulateAppend:
         rush = RushOrderInput(
             product_id=product.id,
             quantity=50,
-            target_date=_now() + timedelta(days=5),
+            target_date=NOW + timedelta(days=5),
         )
 
         scenario = svc._simulate_append(rush, product, line, [existing_job], 2.0)
@@ -197,7 +205,7 @@ class TestSimulateAppend:
         svc = SimulatorService(mock_db)
         product = product_factory.create(sku="RUSH-C", standard_cycle_time=1.0)
         line = line_factory.create(status="active")
-        far_target = _now() + timedelta(days=30)
+        far_target = NOW + timedelta(days=30)
         rush = RushOrderInput(product_id=product.id, quantity=10, target_date=far_target)
 
         scenario = svc._simulate_append(rush, product, line, [], 1.0)
@@ -221,7 +229,7 @@ class TestSimulateInsert:
         rush = RushOrderInput(
             product_id=product.id,
             quantity=100,
-            target_date=_now() + timedelta(days=5),
+            target_date=NOW + timedelta(days=5),
         )
 
         scenario = svc._simulate_insert(rush, product, line, [], 3.0)
@@ -248,7 +256,7 @@ class TestSimulateInsert:
         rush = RushOrderInput(
             product_id=product.id,
             quantity=100,
-            target_date=_now() + timedelta(days=5),
+            target_date=NOW + timedelta(days=5),
         )
 
         scenario = svc._simulate_insert(rush, product, line, [future_job], 4.0)
@@ -265,11 +273,25 @@ class TestSimulateInsert:
 class TestImpactCalculation:
     """Test cost and impact calculations."""
 
-    def test_overtime_cost_calculation(self):
-        """Overtime cost uses correct rate."""
-        overtime_hours = 2.5
-        expected_cost = overtime_hours * OVERTIME_COST_PER_HOUR
-        assert expected_cost == 2.5 * 450.0
+    @pytest.mark.parametrize("production_hours", [1.0, 2.5, 8.0])
+    def test_overtime_cost_calculation(
+        self, simulator, product_factory, line_factory, job_factory, production_hours
+    ):
+        """Scenario cost is its overtime hours at the overtime rate."""
+        product = product_factory.create()
+        line = line_factory.create(status="active")
+        existing_job = job_factory.create(
+            production_line_id=line.id,
+            planned_start=datetime(2026, 2, 23, 10, 0, tzinfo=timezone.utc),
+            planned_end=datetime(2026, 2, 23, 14, 0, tzinfo=timezone.utc),
+            product=product,
+        )
+        rush = RushOrderInput(product_id=product.id, quantity=10, target_date=NOW + timedelta(days=5))
+
+        scenario = simulator._simulate_append(rush, product, line, [existing_job], production_hours)
+        assert scenario.additional_cost == pytest.approx(
+            scenario.overtime_hours * OVERTIME_COST_PER_HOUR
+        )
 
     def test_scenario_to_dict(self):
         """Scenario serializes to dict correctly."""
@@ -278,14 +300,14 @@ class TestImpactCalculation:
             description="Test scenario",
             production_line_id=uuid.uuid4(),
             production_line_name="Line 1",
-            completion_time=_now(),
+            completion_time=NOW,
             changeover_time=30.0,
             production_hours=4.0,
             affected_orders=[
                 AffectedOrder(
                     order_item_id=uuid.uuid4(),
-                    original_end=_now(),
-                    new_end=_now() + timedelta(hours=2),
+                    original_end=NOW,
+                    new_end=NOW + timedelta(hours=2),
                     delay_minutes=120.0,
                 )
             ],
@@ -304,8 +326,8 @@ class TestImpactCalculation:
         """AffectedOrder correctly stores delay."""
         ao = AffectedOrder(
             order_item_id=uuid.uuid4(),
-            original_end=_now(),
-            new_end=_now() + timedelta(minutes=90),
+            original_end=NOW,
+            new_end=NOW + timedelta(minutes=90),
             delay_minutes=90.0,
         )
         assert ao.delay_minutes == 90.0
@@ -320,80 +342,50 @@ class TestFullSimulation:
     """Test full simulate_rush_order with mocked DB."""
 
     @pytest.mark.asyncio
-    async def test_product_not_found_raises(self, mock_db):
+    async def test_product_not_found_raises(self):
         """Missing product raises SimulationError."""
-        svc = SimulatorService(mock_db)
-
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_db.execute = AsyncMock(return_value=mock_result)
+        svc = SimulatorService(FakeAsyncSession(FakeResult()))
 
         rush = RushOrderInput(
             product_id=uuid.uuid4(),
             quantity=100,
-            target_date=_now() + timedelta(days=3),
+            target_date=NOW + timedelta(days=3),
         )
         with pytest.raises(SimulationError, match="not found"):
             await svc.simulate_rush_order(rush)
 
     @pytest.mark.asyncio
-    async def test_no_active_lines_raises(self, mock_db, product_factory):
+    async def test_no_active_lines_raises(self, product_factory):
         """No active lines raises SimulationError."""
-        svc = SimulatorService(mock_db)
         product = product_factory.create()
-
-        call_count = 0
-
-        async def mock_execute(stmt):
-            nonlocal call_count
-            call_count += 1
-            mock_result = MagicMock()
-            if call_count == 1:
-                mock_result.scalar_one_or_none.return_value = product
-            else:
-                mock_result.scalars.return_value.all.return_value = []
-            return mock_result
-
-        mock_db.execute = mock_execute
+        # Product lookup, then an empty active-lines query
+        svc = SimulatorService(FakeAsyncSession(FakeResult([product]), FakeResult()))
 
         rush = RushOrderInput(
             product_id=product.id,
             quantity=100,
-            target_date=_now() + timedelta(days=3),
+            target_date=NOW + timedelta(days=3),
         )
         with pytest.raises(SimulationError, match="No active"):
             await svc.simulate_rush_order(rush)
 
     @pytest.mark.asyncio
     async def test_impossible_deadline_still_produces_scenarios(
-        self, mock_db, product_factory, line_factory
+        self, product_factory, line_factory
     ):
         """Very tight deadline still produces scenarios (just won't meet target)."""
-        svc = SimulatorService(mock_db)
         product = product_factory.create(standard_cycle_time=60.0, setup_time=120.0)
         line = line_factory.create(status="active")
-
-        call_count = 0
-
-        async def mock_execute(stmt):
-            nonlocal call_count
-            call_count += 1
-            mock_result = MagicMock()
-            if call_count == 1:
-                mock_result.scalar_one_or_none.return_value = product
-            elif call_count == 2:
-                mock_result.scalars.return_value.all.return_value = [line]
-            else:
-                mock_result.scalars.return_value.all.return_value = []
-            return mock_result
-
-        mock_db.execute = mock_execute
+        # Product, active lines, then no planned jobs
+        svc = SimulatorService(
+            FakeAsyncSession(FakeResult([product]), FakeResult([line]), FakeResult())
+        )
 
         # Target date in the past = impossible
         rush = RushOrderInput(
             product_id=product.id,
             quantity=1000,
-            target_date=_now() - timedelta(days=1),
+            target_date=NOW - timedelta(days=1),
         )
         result = await svc.simulate_rush_order(rush)
         assert result["total_scenarios"] > 0
@@ -410,20 +402,18 @@ class TestFullSimulation:
 class TestSimulatorUtilities:
     """Test simulator utility methods."""
 
-    def test_is_product_allowed_no_restriction(self, line_factory):
-        """No restriction means all products allowed."""
-        line = line_factory.create(allowed_products=None)
-        assert is_product_allowed("ANY", line) is True
-
-    def test_is_product_allowed_in_list(self, line_factory):
-        """Product in allowed list is accepted."""
-        line = line_factory.create(allowed_products=["SKU-A", "SKU-B"])
-        assert is_product_allowed("SKU-A", line) is True
-
-    def test_is_product_not_allowed(self, line_factory):
-        """Product not in allowed list is rejected."""
-        line = line_factory.create(allowed_products=["SKU-A"])
-        assert is_product_allowed("SKU-Z", line) is False
+    @pytest.mark.parametrize(
+        "allowed_products,sku,expected",
+        [
+            pytest.param(None, "ANY", True, id="no-restriction"),
+            pytest.param(["SKU-A", "SKU-B"], "SKU-A", True, id="in-list"),
+            pytest.param(["SKU-A"], "SKU-Z", False, id="not-in-list"),
+        ],
+    )
+    def test_is_product_allowed(self, line_factory, allowed_products, sku, expected):
+        """Only a non-empty allowed list restricts products."""
+        line = line_factory.create(allowed_products=allowed_products)
+        assert is_product_allowed(sku, line) is expected
 
     def test_advance_work_hours_within_day(self):
         """Advancing within a work day stays on same day."""
@@ -440,12 +430,25 @@ class TestSimulatorUtilities:
         # Should wrap to next work day
         assert result >= start + timedelta(hours=5)
 
-    def test_changeover_same_product_zero(self, line_factory):
-        """Same product has zero changeover."""
-        line = line_factory.create(changeover_matrix={"default": 30})
-        assert get_changeover_time("A", "A", line) == 0.0
-
-    def test_changeover_none_from_sku(self, line_factory):
-        """None from_sku (first job) has zero changeover."""
+    @pytest.mark.parametrize("hours", [0.5, 3.0, 9.0, 20.0, 40.0])
+    def test_advance_work_hours_lands_in_work_time(self, hours):
+        """From any start in a week, the result is at least `hours` later and inside work time."""
+        week_start = datetime(2026, 2, 21, 0, 7, tzinfo=timezone.utc)  # Saturday
+        for offset in range(7 * 24):
+            start = week_start + timedelta(hours=offset)
+            result = SimulatorService._advance_work_hours(start, hours)
+            assert result - start >= timedelta(hours=hours)
+            assert result.weekday() < 5
+            assert time(DEFAULT_WORK_START_HOUR) <= result.time() <= time(DEFAULT_WORK_END_HOUR)
+
+    @pytest.mark.parametrize(
+        "from_sku",
+        [
+            pytest.param("A", id="same-product"),
+            pytest.param(None, id="first-job"),
+        ],
+    )
+    def test_changeover_zero(self, line_factory, from_sku):
+        """No changeover for the same product or the first job on a line."""
         line = line_factory.create(changeover_matrix={"default": 30})
-        assert get_changeover_time(None, "A", line) == 0.0
+        assert get_changeover_time(from_sku, "A", line) == 0.0
@@ -1,18 +1,18 @@
 """Tests for Process Stations CRUD API endpoints."""
 
-import uuid
-from unittest.mock import AsyncMock, MagicMock
-
 import pytest
+from fastapi import HTTPException
 
 from app.api.v1.stations import create_station, delete_station, get_station, list_stations, update_station
 from app.schemas.process_station import ProcessStationCreate
+from tests.fakes import FakeResult, fake_uuid
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def station_payload():
+    """Request body shared by the module; handlers only read from it."""
     return ProcessStationCreate(
-        production_line_id=uuid.uuid4(),
+        production_line_id=fake_uuid(),
         name="SMT Station 1",
         station_order=1,
         equipment_type="SMT",
@@ -26,32 +26,25 @@ def mock_station(station_factory):
 
 
 class TestListStations:
-    @pytest.mark.asyncio
     async def test_list_returns_stations(self, mock_db, station_factory):
-        stations = [station_factory.create(), station_factory.create()]
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = stations
-        mock_db.execute = AsyncMock(return_value=mock_result)
+        stations = station_factory.create_batch(2)
+        mock_db.execute.return_value = FakeResult(stations)
 
         result = await list_stations(production_line_id=None, skip=0, limit=50, db=mock_db)
         assert len(result) == 2
         mock_db.execute.assert_awaited_once()
 
-    @pytest.mark.asyncio
     async def test_list_filters_by_line_id(self, mock_db, station_factory):
-        line_id = uuid.uuid4()
-        mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = [station_factory.create(production_line_id=line_id)]
-        mock_db.execute = AsyncMock(return_value=mock_result)
+        line_id = fake_uuid()
+        station = station_factory.create(production_line_id=line_id)
+        mock_db.execute.return_value = FakeResult([station])
 
         result = await list_stations(production_line_id=line_id, skip=0, limit=50, db=mock_db)
         assert len(result) == 1
 
 
 class TestCreateStation:
-    @pytest.mark.asyncio
     async def test_create_success(self, mock_db, station_payload):
-        mock_db.refresh = AsyncMock()
         result = await create_station(payload=station_payload, db=mock_db)
         mock_db.add.assert_called_once()
         mock_db.flush.assert_awaited_once()
@@ -59,64 +52,46 @@ class TestCreateStation:
 
 
 class TestGetStation:
-    @pytest.mark.asyncio
     async def test_get_found(self, mock_db, mock_station):
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = mock_station
-        mock_db.execute = AsyncMock(return_value=mock_result)
+        mock_db.execute.return_value = FakeResult([mock_station])
 
         result = await get_station(station_id=mock_station.id, db=mock_db)
-        assert result == mock_station
-
-    @pytest.mark.asyncio
-    async def test_get_not_found(self, mock_db):
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_db.execute = AsyncMock(return_value=mock_result)
-
-        with pytest.raises(Exception) as exc_info:
-            await get_station(station_id=uuid.uuid4(), db=mock_db)
-        assert exc_info.value.status_code == 404
+        assert result is mock_station
 
 
 class TestUpdateStation:
-    @pytest.mark.asyncio
     async def test_update_success(self, mock_db, mock_station, station_payload):
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = mock_station
-        mock_db.execute = AsyncMock(return_value=mock_result)
-        mock_db.refresh = AsyncMock()
+        mock_db.execute.return_value = FakeResult([mock_station])
 
         result = await update_station(station_id=mock_station.id, payload=station_payload, db=mock_db)
         mock_db.flush.assert_awaited_once()
-
-    @pytest.mark.asyncio
-    async def test_update_not_found(self, mock_db, station_payload):
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_db.execute = AsyncMock(return_value=mock_result)
-
-        with pytest.raises(Exception) as exc_info:
-            await update_station(station_id=uuid.uuid4(), payload=station_payload, db=mock_db)
-        assert exc_info.value.status_code == 404
+        # The fetched row is updated in place from the payload
+        assert result is mock_station
+        assert mock_station.name == station_payload.name
+        assert mock_station.production_line_id == station_payload.production_line_id
 
 
 class TestDeleteStation:
-    @pytest.mark.asyncio
     async def test_delete_success(self, mock_db, mock_station):
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = mock_station
-        mock_db.execute = AsyncMock(return_value=mock_result)
+        mock_db.execute.return_value = FakeResult([mock_station])
 
         await delete_station(station_id=mock_station.id, db=mock_db)
         mock_db.delete.assert_awaited_once_with(mock_station)
 
-    @pytest.mark.asyncio
-    async def test_delete_not_found(self, mock_db):
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_db.execute = AsyncMock(return_value=mock_result)
 
-        with pytest.raises(Exception) as exc_info:
-            await delete_station(station_id=uuid.uuid4(), db=mock_db)
+class TestStationNotFound:
+    @pytest.mark.parametrize(
+        "handler,takes_payload",
+        [
+            pytest.param(get_station, False, id="get"),
+            pytest.param(update_station, True, id="update"),
+            pytest.param(delete_station, False, id="delete"),
+        ],
+    )
+    async def test_not_found(self, mock_db, station_payload, handler, takes_payload):
+        mock_db.execute.return_value = FakeResult()
+        kwargs = {"payload": station_payload} if takes_payload else {}
+
+        with pytest.raises(HTTPException) as exc_info:
+            await handler(station_id=fake_uuid(), db=mock_db, **kwargs)
         assert exc_info.value.status_code == 404